@@ -5,28 +5,68 @@ This authorizer validates API key authentication for the data-api-server HTTP AP
 It reads the API key from AWS Secrets Manager and compares it with the x-api-key header.
 """
 
+import hmac
 import json
 import os
-import boto3
+import time
 from typing import Dict, Any
 
-# Initialize Secrets Manager client (cached across invocations)
-secrets_client = boto3.client("secretsmanager")
+# How long a fetched API key is trusted before Secrets Manager is queried again,
+# so that key rotations propagate without a redeploy
+API_KEY_CACHE_TTL_SECONDS = int(os.environ.get("API_KEY_CACHE_TTL_SECONDS", "300"))
+
+# Secrets Manager client (created on first use and reused across invocations)
+secrets_client = None
 
 # Cache for the API key (populated on first invocation)
 _api_key_cache = None
+_api_key_fetched_at = 0.0
 
 
-def get_api_key() -> str:
+def get_secrets_client():
     """
-    Retrieve the API key from AWS Secrets Manager with caching.
+    Return the Secrets Manager client, creating it on first use.
 
     Returns:
-        The API key string
+        The boto3 Secrets Manager client
+    """
+    global secrets_client
+
+    if secrets_client is None:
+        # Imported here so requests rejected before the key check never pay for loading boto3
+        import boto3
+        from botocore.config import Config
+
+        # Fail fast: API Gateway gives the authorizer a short budget, so a slow
+        # Secrets Manager call should be retried once rather than hang
+        secrets_client = boto3.client(
+            "secretsmanager",
+            config=Config(
+                connect_timeout=1,
+                read_timeout=2,
+                retries={"max_attempts": 2, "mode": "standard"},
+                max_pool_connections=2,
+                tcp_keepalive=True,
+            ),
+        )
+    return secrets_client
+
+
+def get_api_key_bytes() -> bytes:
     """
-    global _api_key_cache
+    Retrieve the UTF-8 encoded API key from AWS Secrets Manager with caching.
+
+    The key is cached already encoded so each request only encodes the provided key.
+    The cached key is refreshed once it is older than API_KEY_CACHE_TTL_SECONDS.
+    If the refresh fails, the previously cached key keeps being served and the
+    refresh is retried on the next call.
 
-    if _api_key_cache is not None:
+    Returns:
+        The API key as bytes
+    """
+    global _api_key_cache, _api_key_fetched_at
+
+    if _api_key_cache is not None and time.monotonic() - _api_key_fetched_at < API_KEY_CACHE_TTL_SECONDS:
         return _api_key_cache
 
     secret_arn = os.environ.get("API_KEY_SECRET_ARN")
@@ -34,40 +74,52 @@ def get_api_key() -> str:
         raise ValueError("API_KEY_SECRET_ARN environment variable not set")
 
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_arn)
+        response = get_secrets_client().get_secret_value(SecretId=secret_arn)
         secret_data = json.loads(response["SecretString"])
-        _api_key_cache = secret_data["api_key"]
+        _api_key_cache = secret_data["api_key"].encode("utf-8")
+        _api_key_fetched_at = time.monotonic()
         return _api_key_cache
     except Exception as e:
+        if _api_key_cache is not None:
+            print(f"Failed to refresh API key, using cached key: {str(e)}")
+            return _api_key_cache
         raise ValueError(f"Failed to retrieve API key from Secrets Manager: {str(e)}")
 
 
+def get_api_key() -> str:
+    """
+    Retrieve the API key from AWS Secrets Manager with caching.
+
+    Returns:
+        The API key string
+    """
+    return get_api_key_bytes().decode("utf-8")
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda authorizer handler for HTTP API.
 
-    Expected event structure from API Gateway HTTP API:
+    Only the headers of the API Gateway HTTP API event are used; the request
+    context and route ARN are ignored (simple response format):
     {
         "headers": {
             "x-api-key": "the-api-key"
         },
-        "requestContext": {
-            "http": {
-                "method": "GET",
-                "path": "/files/list"
-            }
-        },
-        "routeArn": "arn:aws:execute-api:region:account:api-id/stage/method/path"
+        ...
     }
 
+    The event is deliberately not logged, since it contains the API key.
+
     Returns:
         Authorization response with isAuthorized boolean
     """
-    print(f"Authorizer invoked with event: {json.dumps(event)}")
-
-    # Extract the API key from headers (case-insensitive)
-    headers = event.get("headers", {})
-    provided_key = headers.get("x-api-key") or headers.get("X-API-Key") or headers.get("X-Api-Key")
+    # Extract the API key from headers (case-insensitive). HTTP API v2 events
+    # already lowercase header names, so the scan is only a fallback.
+    headers = event.get("headers") or {}
+    provided_key = headers.get("x-api-key")
+    if provided_key is None:
+        provided_key = next((value for name, value in headers.items() if name.lower() == "x-api-key"), None)
 
     if not provided_key:
         print("Authorization denied: Missing x-api-key header")
@@ -77,11 +129,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     try:
         # Get the expected API key from Secrets Manager
-        expected_key = get_api_key()
+        expected_key = get_api_key_bytes()
 
-        # Simple string comparison (constant-time comparison would be better for production)
-        if provided_key == expected_key:
-            print("Authorization granted")
+        # Constant-time comparison so the response time does not leak how much of the key matched
+        if hmac.compare_digest(provided_key.encode("utf-8"), expected_key):
             return {
                 "isAuthorized": True,
                 "context": {
@@ -6,6 +6,7 @@ in the real AWS environment with actual Secrets Manager integration.
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 import pytest
@@ -206,25 +207,32 @@ class TestAuthorizerE2E:
 
     @pytest.mark.e2e
     def test_authorizer_caching_behavior(self, lambda_client, lambda_function_name, valid_api_key):
-        """Test that authorizer performs well with repeated invocations (cache test)."""
+        """Test that authorizer performs well with repeated concurrent invocations (cache test)."""
         event = {
             "headers": {
                 "x-api-key": valid_api_key
             }
         }
-
-        # Invoke multiple times rapidly
-        for i in range(5):
-            response = lambda_client.invoke(
-                FunctionName=lambda_function_name,
-                InvocationType="RequestResponse",
-                Payload=json.dumps(event),
-            )
-
+        payload_json = json.dumps(event)
+
+        # Invoke concurrently; boto3 clients are thread-safe for API calls
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(
+                    lambda_client.invoke,
+                    FunctionName=lambda_function_name,
+                    InvocationType="RequestResponse",
+                    Payload=payload_json,
+                )
+                for _ in range(5)
+            ]
+            responses = [future.result() for future in futures]
+
+        for response in responses:
             payload = json.loads(response["Payload"].read())
 
             # All invocations should succeed
             assert response["StatusCode"] == 200
             assert payload["isAuthorized"] is True
 
-        print("Successfully completed 5 rapid invocations - caching working correctly")
+        print("Successfully completed 5 concurrent invocations - caching working correctly")
@@ -2,15 +2,12 @@
 
 import json
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from botocore.exceptions import ClientError
 
-# Mock the boto3 client before importing authorizer to avoid NoRegionError
-with patch("boto3.client") as mock_client:
-    mock_client.return_value = MagicMock()
-    from authorizer import get_api_key, lambda_handler
+from authorizer import get_api_key, lambda_handler
 
 
 @pytest.fixture
@@ -32,8 +29,44 @@ def reset_cache():
     """Reset the API key cache before each test."""
     import authorizer
     authorizer._api_key_cache = None
+    authorizer._api_key_fetched_at = 0.0
     yield
     authorizer._api_key_cache = None
+    authorizer._api_key_fetched_at = 0.0
+
+
+class TestGetSecretsClient:
+    """Unit tests for get_secrets_client function."""
+
+    @pytest.mark.unit
+    def test_client_created_once_on_first_use(self):
+        """Test that the Secrets Manager client is created lazily and reused."""
+        import authorizer
+
+        with patch("authorizer.secrets_client", None), patch("boto3.client") as mock_boto_client:
+            client1 = authorizer.get_secrets_client()
+            client2 = authorizer.get_secrets_client()
+
+        assert client1 is client2
+        mock_boto_client.assert_called_once()
+        assert mock_boto_client.call_args.args == ("secretsmanager",)
+        config = mock_boto_client.call_args.kwargs["config"]
+        assert config.connect_timeout == 1
+        assert config.read_timeout == 2
+        assert config.retries == {"max_attempts": 2, "mode": "standard"}
+        assert config.tcp_keepalive is True
+
+    @pytest.mark.unit
+    def test_missing_header_does_not_import_boto3(self):
+        """Test that requests without an API key are denied without creating a client."""
+        import authorizer
+
+        with patch("authorizer.secrets_client", None), patch("boto3.client") as mock_boto_client:
+            result = lambda_handler({"headers": {}}, None)
+
+            assert result == {"isAuthorized": False}
+            assert authorizer.secrets_client is None
+        mock_boto_client.assert_not_called()
 
 
 class TestGetApiKey:
@@ -71,6 +104,62 @@ class TestGetApiKey:
         # But Secrets Manager should only be called once (caching)
         mock_secrets_client.get_secret_value.assert_called_once()
 
+    @pytest.mark.unit
+    def test_get_api_key_caches_encoded_key(self, mock_secrets_client, mock_env):
+        """Test that the API key is cached as UTF-8 bytes."""
+        import authorizer
+
+        mock_secrets_client.get_secret_value.return_value = {
+            "SecretString": json.dumps({"api_key": "test-api-key-12345"})
+        }
+
+        assert authorizer.get_api_key_bytes() == b"test-api-key-12345"
+        assert authorizer._api_key_cache == b"test-api-key-12345"
+
+    @pytest.mark.unit
+    def test_get_api_key_refreshes_after_ttl(self, mock_secrets_client, mock_env):
+        """Test that a cached API key is refetched once the TTL has expired."""
+        import authorizer
+
+        mock_secrets_client.get_secret_value.side_effect = [
+            {"SecretString": json.dumps({"api_key": "old-api-key"})},
+            {"SecretString": json.dumps({"api_key": "rotated-api-key"})},
+        ]
+
+        with patch("authorizer.time.monotonic", return_value=1000.0):
+            assert get_api_key() == "old-api-key"
+
+        # Still within the TTL: served from cache
+        with patch("authorizer.time.monotonic", return_value=1000.0 + authorizer.API_KEY_CACHE_TTL_SECONDS - 1):
+            assert get_api_key() == "old-api-key"
+
+        # TTL expired: refetched from Secrets Manager
+        with patch("authorizer.time.monotonic", return_value=1000.0 + authorizer.API_KEY_CACHE_TTL_SECONDS):
+            assert get_api_key() == "rotated-api-key"
+
+        assert mock_secrets_client.get_secret_value.call_count == 2
+
+    @pytest.mark.unit
+    def test_get_api_key_serves_cached_key_when_refresh_fails(self, mock_secrets_client, mock_env):
+        """Test that an expired cached key is still served if Secrets Manager is unavailable."""
+        import authorizer
+
+        mock_secrets_client.get_secret_value.side_effect = [
+            {"SecretString": json.dumps({"api_key": "test-api-key-12345"})},
+            ClientError(
+                {"Error": {"Code": "InternalServiceError", "Message": "Service unavailable"}},
+                "GetSecretValue"
+            ),
+        ]
+
+        with patch("authorizer.time.monotonic", return_value=1000.0):
+            assert get_api_key() == "test-api-key-12345"
+
+        with patch("authorizer.time.monotonic", return_value=1000.0 + authorizer.API_KEY_CACHE_TTL_SECONDS):
+            assert get_api_key() == "test-api-key-12345"
+
+        assert mock_secrets_client.get_secret_value.call_count == 2
+
     @pytest.mark.unit
     def test_get_api_key_missing_env_var(self, mock_secrets_client):
         """Test error handling when API_KEY_SECRET_ARN is not set."""
@@ -186,6 +275,31 @@ class TestLambdaHandler:
         assert result["isAuthorized"] is True
         assert result["context"]["authMethod"] == "api-key"
 
+    @pytest.mark.unit
+    def test_lambda_handler_success_arbitrary_case_header(self, mock_secrets_client, mock_env):
+        """Test successful authorization with any header casing, e.g. X-api-KEY."""
+        mock_secrets_client.get_secret_value.return_value = {
+            "SecretString": json.dumps({"api_key": "test-api-key-12345"})
+        }
+
+        event = {
+            "headers": {
+                "X-api-KEY": "test-api-key-12345"
+            }
+        }
+
+        result = lambda_handler(event, None)
+
+        assert result["isAuthorized"] is True
+
+    @pytest.mark.unit
+    def test_lambda_handler_null_headers(self, mock_secrets_client, mock_env):
+        """Test authorization failure when headers is null in the event."""
+        result = lambda_handler({"headers": None}, None)
+
+        assert result == {"isAuthorized": False}
+        mock_secrets_client.get_secret_value.assert_not_called()
+
     @pytest.mark.unit
     def test_lambda_handler_missing_header(self, mock_secrets_client, mock_env):
         """Test authorization failure when x-api-key header is missing."""
@@ -225,6 +339,23 @@ class TestLambdaHandler:
 
         assert result == {"isAuthorized": False}
 
+    @pytest.mark.unit
+    def test_lambda_handler_non_ascii_api_key(self, mock_secrets_client, mock_env):
+        """Test authorization failure with a non-ASCII API key."""
+        mock_secrets_client.get_secret_value.return_value = {
+            "SecretString": json.dumps({"api_key": "test-api-key-12345"})
+        }
+
+        event = {
+            "headers": {
+                "x-api-key": "test-api-key-1234é"
+            }
+        }
+
+        result = lambda_handler(event, None)
+
+        assert result == {"isAuthorized": False}
+
     @pytest.mark.unit
     def test_lambda_handler_empty_api_key(self, mock_secrets_client, mock_env):
         """Test authorization failure with empty API key."""
@@ -319,6 +450,20 @@ class TestLambdaHandler:
         assert result["isAuthorized"] is True
         assert result["context"]["authMethod"] == "api-key"
 
+    @pytest.mark.unit
+    def test_lambda_handler_does_not_log_api_key(self, mock_secrets_client, mock_env, capsys):
+        """Test that neither the provided nor the expected API key ends up in the logs."""
+        mock_secrets_client.get_secret_value.return_value = {
+            "SecretString": json.dumps({"api_key": "test-api-key-12345"})
+        }
+
+        lambda_handler({"headers": {"x-api-key": "test-api-key-12345"}}, None)
+        lambda_handler({"headers": {"x-api-key": "wrong-api-key"}}, None)
+
+        output = capsys.readouterr().out
+        assert "test-api-key-12345" not in output
+        assert "wrong-api-key" not in output
+
     @pytest.mark.unit
     def test_lambda_handler_generic_exception(self, mock_secrets_client, mock_env):
         """Test authorization failure when an unexpected exception occurs."""
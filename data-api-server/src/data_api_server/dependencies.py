@@ -0,0 +1,36 @@
+"""Lazily created settings and services shared by the FastAPI app and the Lambda handler."""
+
+from functools import lru_cache
+
+from botocore.config import Config
+
+from ai_voice_shared.services.s3_service import S3Service
+from ai_voice_shared.settings import S3Settings
+from .settings import Settings
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Load settings on first use so cold starts that only hit /health skip it."""
+    return Settings()
+
+
+@lru_cache
+def get_s3_service() -> S3Service:
+    """Create the S3 service on first use and reuse it for the lifetime of the process."""
+    settings = get_settings()
+    s3_settings = S3Settings(
+        aws_region=settings.aws_region,
+        s3_bucket_name=settings.s3_bucket_name,
+        aws_profile=settings.aws_profile,
+    )
+    # Connection pool large enough for concurrent LIST/HEAD calls (the botocore
+    # default is 10 connections), keeping idle connections alive between warm invocations
+    return S3Service(
+        s3_settings,
+        client_config=Config(
+            max_pool_connections=50,
+            retries={"max_attempts": 3, "mode": "standard"},
+            tcp_keepalive=True,
+        ),
+    )
@@ -0,0 +1,154 @@
+"""File operations behind the Data API endpoints.
+
+These functions hold the request validation and S3 calls for each endpoint and
+do not depend on FastAPI, so both the FastAPI app (local development) and the
+framework-free Lambda handler use the same logic.
+"""
+
+import asyncio
+import logging
+from urllib.parse import unquote
+
+from ai_voice_shared.models import (
+    S3ListResponse,
+    S3ListIdsResponse,
+    MessageArtifactsResponse,
+    BatchMessageArtifactsResponse,
+)
+from ai_voice_shared.services.s3_service import S3Service
+
+logger = logging.getLogger(__name__)
+
+VALID_INTENTS = frozenset({"job-to-be-done", "knowledge-document", "other"})
+VALID_OUTPUT_FORMATS = frozenset({"full", "ids"})
+
+# Error messages are built once instead of on every rejected request
+INVALID_INTENT_DETAIL = f"Invalid message_intent. Must be one of: {', '.join(sorted(VALID_INTENTS))}"
+INVALID_OUTPUT_FORMAT_DETAIL = (
+    f"Invalid output_format. Must be one of: {', '.join(sorted(VALID_OUTPUT_FORMATS))}"
+)
+
+
+class FileRequestError(Exception):
+    """A file request that should be answered with an HTTP error status."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def list_files(
+    s3_service: S3Service,
+    company_id: str,
+    message_intent: str,
+    output_format: str = "full",
+    continuation_token: str | None = None,
+) -> S3ListResponse | S3ListIdsResponse:
+    """
+    List files for a company and message intent.
+
+    Raises:
+        FileRequestError: 400 for invalid parameters, 500 if the S3 operation fails
+    """
+    if message_intent not in VALID_INTENTS:
+        raise FileRequestError(400, INVALID_INTENT_DETAIL)
+
+    if output_format not in VALID_OUTPUT_FORMATS:
+        raise FileRequestError(400, INVALID_OUTPUT_FORMAT_DETAIL)
+
+    try:
+        if output_format == "ids":
+            return await s3_service.list_objects_ids_only(
+                company_id=company_id,
+                message_intent=message_intent,
+                continuation_token=continuation_token,
+            )
+        return await s3_service.list_objects(
+            company_id=company_id,
+            message_intent=message_intent,
+            continuation_token=continuation_token,
+        )
+    except Exception as e:
+        logger.error(f"Error listing files: {e}")
+        raise FileRequestError(500, "Internal server error")
+
+
+async def get_files_by_message(
+    s3_service: S3Service,
+    company_id: str,
+    message_id: str,
+) -> MessageArtifactsResponse:
+    """
+    Get all artifacts stored for a message.
+
+    Raises:
+        FileRequestError: 404 if the message has no artifacts, 500 for other errors
+    """
+    try:
+        result = await s3_service.list_files_by_message_id(
+            company_id=company_id,
+            message_id=message_id,
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving message artifacts: {e}")
+        raise FileRequestError(500, "Internal server error")
+
+    if result is None:
+        raise FileRequestError(404, f"No artifacts found for message {message_id}")
+
+    return result
+
+
+async def get_files_by_messages(
+    s3_service: S3Service,
+    company_id: str,
+    message_ids: list[str],
+) -> BatchMessageArtifactsResponse:
+    """
+    Get the artifacts stored for several messages, looking them up concurrently.
+
+    Messages without artifacts map to None instead of failing the whole batch.
+
+    Raises:
+        FileRequestError: 500 if any S3 lookup fails
+    """
+    # Duplicate IDs are looked up once; dict.fromkeys keeps the request order
+    unique_ids = list(dict.fromkeys(message_ids))
+
+    try:
+        results = await asyncio.gather(
+            *(
+                s3_service.list_files_by_message_id(company_id=company_id, message_id=message_id)
+                for message_id in unique_ids
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving message artifacts: {e}")
+        raise FileRequestError(500, "Internal server error")
+
+    return BatchMessageArtifactsResponse(
+        company_id=company_id,
+        messages=dict(zip(unique_ids, results)),
+    )
+
+
+async def get_download_url(s3_service: S3Service, key: str) -> dict[str, str]:
+    """
+    Generate a presigned download URL for a URL-encoded S3 key.
+
+    Raises:
+        FileRequestError: 404 if the file does not exist, 500 for other errors
+    """
+    decoded_key = unquote(key)
+
+    try:
+        url = await s3_service.generate_presigned_url(decoded_key)
+        return {"url": url}
+    except ValueError:
+        # Object not found
+        logger.warning(f"File not found: {decoded_key}")
+        raise FileRequestError(404, "File not found")
+    except Exception as e:
+        logger.error(f"Error generating presigned URL: {e}")
+        raise FileRequestError(500, "Internal server error")
@@ -0,0 +1,188 @@
+"""AWS Lambda entrypoint for the Data API.
+
+Dispatches API Gateway HTTP API (payload format 2.0) events directly to the
+file operations, so cold starts do not import FastAPI, Starlette or Mangum.
+The file operations (and with them pydantic and boto3) are imported on the
+first file request, so health checks stay cheap on a cold container.
+The FastAPI app in main.py serves the same routes for local development.
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+from typing import Any, Dict
+from urllib.parse import parse_qsl
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Stage name prefix that API Gateway keeps in rawPath (e.g. /dev/files/list)
+STAGE_PREFIX = f"/{os.environ.get('ENVIRONMENT', 'dev')}"
+
+# Required query parameters for each GET file route
+REQUIRED_PARAMS = {
+    "/files/list": ("company_id", "message_intent"),
+    "/files/by-message": ("company_id", "message_id"),
+    "/files/get-download-url": ("key",),
+}
+
+# POST route taking a JSON body instead of query parameters
+BATCH_ROUTE = "/files/by-messages"
+
+
+def _response(status_code: int, body: str) -> Dict[str, Any]:
+    """Build an API Gateway response with a JSON body."""
+    return {
+        "statusCode": status_code,
+        "headers": {"content-type": "application/json"},
+        "body": body,
+    }
+
+
+def _error(status_code: int, detail: Any) -> Dict[str, Any]:
+    """Build an error response in FastAPI's {"detail": ...} format."""
+    return _response(status_code, json.dumps({"detail": detail}, separators=(",", ":")))
+
+
+def _missing_params_error(names: list[str]) -> Dict[str, Any]:
+    """Build a 422 response listing missing query parameters, mirroring FastAPI validation errors."""
+    return _error(
+        422,
+        [
+            {"type": "missing", "loc": ["query", name], "msg": "Field required", "input": None}
+            for name in names
+        ],
+    )
+
+
+def _body_validation_error(error: Any) -> Dict[str, Any]:
+    """Build a 422 response for an invalid JSON body, mirroring FastAPI validation errors."""
+    return _error(
+        422,
+        [
+            {**detail, "loc": ["body", *detail["loc"]]}
+            for detail in json.loads(error.json(include_url=False))
+        ],
+    )
+
+
+def _invalid_body_encoding_error() -> Dict[str, Any]:
+    """Build a 422 response for a body that is not valid base64, mirroring FastAPI validation errors."""
+    return _error(
+        422,
+        [{"type": "value_error", "loc": ["body"], "msg": "Body is not valid base64", "input": None}],
+    )
+
+
+def _parse_batch_request(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate the JSON body of a batch request.
+
+    Raises:
+        binascii.Error: If the body is marked as base64 encoded but is not valid base64
+        pydantic.ValidationError: If the body is not a valid BatchMessagesRequest
+    """
+    from ai_voice_shared.models import BatchMessagesRequest
+
+    body = event.get("body") or ""
+    # HTTP API v2 may base64 encode the body
+    if event.get("isBase64Encoded", False):
+        body = base64.b64decode(body, validate=True)
+
+    request = BatchMessagesRequest.model_validate_json(body)
+    return {"company_id": request.company_id, "message_ids": request.message_ids}
+
+
+async def _dispatch(path: str, params: Dict[str, Any]) -> Any:
+    """Run the file operation for a route."""
+    from . import files
+    from .dependencies import get_s3_service
+
+    s3_service = get_s3_service()
+
+    if path == "/files/list":
+        return await files.list_files(
+            s3_service,
+            company_id=params["company_id"],
+            message_intent=params["message_intent"],
+            output_format=params.get("output_format", "full"),
+            continuation_token=params.get("nextContinuationToken"),
+        )
+    if path == "/files/by-message":
+        return await files.get_files_by_message(
+            s3_service,
+            company_id=params["company_id"],
+            message_id=params["message_id"],
+        )
+    if path == BATCH_ROUTE:
+        return await files.get_files_by_messages(
+            s3_service,
+            company_id=params["company_id"],
+            message_ids=params["message_ids"],
+        )
+    return await files.get_download_url(s3_service, params["key"])
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Handle an API Gateway HTTP API request.
+
+    Args:
+        event: API Gateway HTTP API event (payload format 2.0)
+        context: Lambda context
+
+    Returns:
+        API Gateway proxy response
+    """
+    path = event.get("rawPath", "/")
+    if path == STAGE_PREFIX or path.startswith(f"{STAGE_PREFIX}/"):
+        path = path[len(STAGE_PREFIX):] or "/"
+    method = event.get("requestContext", {}).get("http", {}).get("method", "GET")
+
+    if path == "/health":
+        if method != "GET":
+            return _error(405, "Method Not Allowed")
+        return _response(200, '{"status":"healthy"}')
+
+    if path == BATCH_ROUTE:
+        if method != "POST":
+            return _error(405, "Method Not Allowed")
+
+        from pydantic import ValidationError
+
+        try:
+            params = _parse_batch_request(event)
+        except ValidationError as e:
+            return _body_validation_error(e)
+        except binascii.Error:
+            return _invalid_body_encoding_error()
+    else:
+        if path not in REQUIRED_PARAMS:
+            return _error(404, "Not Found")
+        if method != "GET":
+            return _error(405, "Method Not Allowed")
+
+        # Parse the raw query string like Starlette does: blank values are kept
+        # and the last occurrence of a repeated parameter wins
+        params = dict(parse_qsl(event.get("rawQueryString", ""), keep_blank_values=True))
+
+        missing = [name for name in REQUIRED_PARAMS[path] if name not in params]
+        if missing:
+            return _missing_params_error(missing)
+
+    from . import files
+
+    try:
+        result = asyncio.run(_dispatch(path, params))
+    except files.FileRequestError as e:
+        return _error(e.status_code, e.detail)
+    except Exception as e:
+        logger.error(f"Unhandled error for {path}: {e}", exc_info=True)
+        return _error(500, "Internal server error")
+
+    if hasattr(result, "model_dump_json"):
+        return _response(200, result.model_dump_json())
+    return _response(200, json.dumps(result, separators=(",", ":")))
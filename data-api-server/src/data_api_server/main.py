@@ -1,20 +1,24 @@
 """FastAPI application for Data API Server."""
 
 import logging
-from urllib.parse import unquote
+import os
+from functools import lru_cache
+from typing import Any
 
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
-from mangum import Mangum
+from fastapi import Depends, FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
 
 from ai_voice_shared.models import (
     S3ListResponse,
     S3ListIdsResponse,
     MessageArtifactsResponse,
+    BatchMessagesRequest,
+    BatchMessageArtifactsResponse,
 )
 from ai_voice_shared.services.s3_service import S3Service
-from ai_voice_shared.settings import S3Settings
-from .settings import Settings
+from . import files
+from .dependencies import get_s3_service, get_settings
 
 # Configure logging
 logging.basicConfig(
@@ -23,15 +27,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize settings
-settings = Settings()
-
-# Initialize S3 settings from general settings
-s3_settings = S3Settings(
-    aws_region=settings.aws_region,
-    s3_bucket_name=settings.s3_bucket_name,
-    aws_profile=settings.aws_profile,
-)
+# Static response bodies, encoded once instead of per request
+FORBIDDEN_BODY = b'{"message":"Forbidden"}'
+HEALTHY_BODY = b'{"status":"healthy"}'
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -40,8 +38,21 @@ app = FastAPI(
     version="0.1.0",
 )
 
-# Initialize S3 service
-s3_service = S3Service(s3_settings)
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model directly.
+
+    Returning a Response skips FastAPI's re-validation and serialization of the
+    model; response_model on the route still documents it in the OpenAPI schema.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+@app.exception_handler(files.FileRequestError)
+async def file_request_error_handler(request: Request, exc: files.FileRequestError) -> JSONResponse:
+    """Return file operation errors in FastAPI's standard error format."""
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
 
 # Middleware for API key validation (for local testing)
@@ -49,29 +60,27 @@ s3_service = S3Service(s3_settings)
 @app.middleware("http")
 async def validate_api_key(request: Request, call_next):
     """Validate API key if configured."""
-    # Skip validation for health check
-    if request.url.path == "/health":
+    # Skip validation for health check; the raw scope path avoids building request.url
+    if request.scope["path"] == "/health":
         return await call_next(request)
 
     # Only validate if API key is configured (for local testing)
-    if settings.api_key:
+    expected_api_key = get_settings().api_key
+    if expected_api_key:
         api_key = request.headers.get("x-api-key")
-        if not api_key or api_key != settings.api_key:
-            return JSONResponse(
-                status_code=403,
-                content={"message": "Forbidden"},
-            )
+        if not api_key or api_key != expected_api_key:
+            return Response(content=FORBIDDEN_BODY, status_code=403, media_type="application/json")
 
     return await call_next(request)
 
 
-@app.get("/health")
-async def health_check() -> dict[str, str]:
+@app.get("/health", response_model=dict[str, str])
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=HEALTHY_BODY, media_type="application/json")
 
 
-@app.get("/files/list")
+@app.get("/files/list", response_model=S3ListResponse | S3ListIdsResponse)
 async def list_files(
     company_id: str = Query(..., description="Company identifier"),
     message_intent: str = Query(
@@ -86,7 +95,8 @@ async def list_files(
         None,
         description="Continuation token from previous response for pagination",
     ),
-) -> S3ListResponse | S3ListIdsResponse:
+    s3_service: S3Service = Depends(get_s3_service),
+) -> Response:
     """
     List files stored in S3 for a specific company and message intent.
 
@@ -111,48 +121,24 @@ async def list_files(
             - nextContinuationToken: Token for next page (null if no more pages)
 
     Raises:
-        HTTPException: 400 for invalid parameters, 500 if S3 operation fails
+        FileRequestError: 400 for invalid parameters, 500 if S3 operation fails
     """
-    # Validate message_intent
-    valid_intents = ["job-to-be-done", "knowledge-document", "other"]
-    if message_intent not in valid_intents:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid message_intent. Must be one of: {', '.join(valid_intents)}",
-        )
-
-    # Validate output_format
-    valid_formats = ["full", "ids"]
-    if output_format not in valid_formats:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid output_format. Must be one of: {', '.join(valid_formats)}",
-        )
-
-    try:
-        if output_format == "ids":
-            result = await s3_service.list_objects_ids_only(
-                company_id=company_id,
-                message_intent=message_intent,
-                continuation_token=nextContinuationToken,
-            )
-        else:
-            result = await s3_service.list_objects(
-                company_id=company_id,
-                message_intent=message_intent,
-                continuation_token=nextContinuationToken,
-            )
-        return result
-    except Exception as e:
-        logger.error(f"Error listing files: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    result = await files.list_files(
+        s3_service,
+        company_id=company_id,
+        message_intent=message_intent,
+        output_format=output_format,
+        continuation_token=nextContinuationToken,
+    )
+    return _json_response(result)
 
 
 @app.get("/files/by-message", response_model=MessageArtifactsResponse)
 async def get_files_by_message(
     company_id: str = Query(..., description="Company identifier"),
     message_id: str = Query(..., description="Twilio message SID"),
-) -> MessageArtifactsResponse:
+    s3_service: S3Service = Depends(get_s3_service),
+) -> Response:
     """
     Get all artifacts for a specific message.
 
@@ -172,31 +158,51 @@ async def get_files_by_message(
         - files: Array of MessageArtifact (key, type, etag, size, last_modified)
 
     Raises:
-        HTTPException: 404 if message not found, 500 for other errors
+        FileRequestError: 404 if message not found, 500 for other errors
+    """
+    result = await files.get_files_by_message(
+        s3_service,
+        company_id=company_id,
+        message_id=message_id,
+    )
+    return _json_response(result)
+
+
+@app.post("/files/by-messages", response_model=BatchMessageArtifactsResponse)
+async def get_files_by_messages(
+    request: BatchMessagesRequest,
+    s3_service: S3Service = Depends(get_s3_service),
+) -> Response:
+    """
+    Get all artifacts for several messages in one request.
+
+    The messages are looked up concurrently, so fetching artifacts for many
+    messages costs one request instead of one per message.
+
+    Args:
+        request: JSON body with the company_id and up to 100 message_ids
+
+    Returns:
+        BatchMessageArtifactsResponse containing:
+        - company_id: The company identifier
+        - messages: Map of message ID to its MessageArtifactsResponse,
+          or null if no artifacts were found for it
+
+    Raises:
+        FileRequestError: 500 if an S3 lookup fails
     """
-    try:
-        result = await s3_service.list_files_by_message_id(
-            company_id=company_id,
-            message_id=message_id,
-        )
-
-        if result is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No artifacts found for message {message_id}",
-            )
-
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving message artifacts: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    result = await files.get_files_by_messages(
+        s3_service,
+        company_id=request.company_id,
+        message_ids=request.message_ids,
+    )
+    return _json_response(result)
 
 
 @app.get("/files/get-download-url")
 async def get_download_url(
     key: str = Query(..., description="S3 object key (URL-encoded)"),
+    s3_service: S3Service = Depends(get_s3_service),
 ) -> dict[str, str]:
     """
     Generate a presigned URL for downloading a file from S3.
@@ -211,24 +217,26 @@ async def get_download_url(
         Dictionary containing the presigned URL
 
     Raises:
-        HTTPException: 404 if file not found, 500 for other errors
+        FileRequestError: 404 if file not found, 500 for other errors
     """
-    # URL-decode the key
-    decoded_key = unquote(key)
-
-    try:
-        url = await s3_service.generate_presigned_url(decoded_key)
-        return {"url": url}
-    except ValueError:
-        # Object not found
-        logger.warning(f"File not found: {decoded_key}")
-        raise HTTPException(status_code=404, detail="File not found")
-    except Exception as e:
-        logger.error(f"Error generating presigned URL: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-
-# Lambda handler
-# Mangum wraps the FastAPI app to make it compatible with AWS Lambda
-# api_gateway_base_path strips the stage name from the path so FastAPI sees /files/list instead of /dev/files/list
-handler = Mangum(app, lifespan="off", api_gateway_base_path=f"/{settings.environment}")
+    return await files.get_download_url(s3_service, key)
+
+
+@lru_cache
+def _get_handler():
+    """
+    Build the Mangum adapter on first use.
+
+    Mangum is only needed when the FastAPI app itself is run in Lambda, so it is
+    not imported for local development or tests.
+    """
+    from mangum import Mangum
+
+    # api_gateway_base_path strips the stage name from the path so FastAPI sees /files/list instead of /dev/files/list
+    # The stage name is read straight from the environment so importing the module does not load Settings
+    return Mangum(app, lifespan="off", api_gateway_base_path=f"/{os.environ.get('ENVIRONMENT', 'dev')}")
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """ASGI Lambda entrypoint for the FastAPI app (the image uses lambda_handler.handler)."""
+    return _get_handler()(event, context)
@@ -1,4 +1,3 @@
-import os
 from unittest.mock import patch
 
 import boto3
@@ -8,82 +7,65 @@ from moto import mock_aws
 
 # Removed: from data_api_server.main import app
 
+# Objects seeded into the mocked bucket once per module
+# Using realistic Twilio-style message IDs (SM + 32 hex chars)
+SEED_OBJECTS = [
+    # Test files for company123, job-to-be-done
+    ("company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_audio.ogg", b"audio_content_1"),
+    ("company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_full_text.txt", b"text_content_1"),
+    ("company123/job-to-be-done/task2_SM2234567890abcdef1234567890abcdef_audio.ogg", b"audio_content_2"),
+    # Test files for company123, knowledge-document
+    ("company123/knowledge-document/doc1_SM3234567890abcdef1234567890abcdef_full_text.txt", b"doc_content_1"),
+    # Test files for another_company, job-to-be-done
+    ("another_company/job-to-be-done/taskA_SM4234567890abcdef1234567890abcdef_audio.ogg", b"audio_content_A"),
+]
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def aws_credentials():
-    """Mocked AWS Credentials for moto."""
-    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
-    os.environ["AWS_SECURITY_TOKEN"] = "testing"
-    os.environ["AWS_SESSION_TOKEN"] = "testing"
-    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
-    # S3_BUCKET_NAME will be set in the client fixture before app import
-
-
-@pytest.fixture(scope="function")
+    """Mocked AWS Credentials for moto, restored when the session ends."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ACCESS_KEY_ID", "testing")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        mp.setenv("AWS_SECURITY_TOKEN", "testing")
+        mp.setenv("AWS_SESSION_TOKEN", "testing")
+        mp.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        # S3_BUCKET_NAME will be set in the s3_service fixture before app import
+        yield
+
+
+@pytest.fixture(scope="module")
 def s3_client(aws_credentials):
-    """Mocked S3 client."""
+    """Mocked S3 client, shared by all tests in this module."""
     with mock_aws():
         yield boto3.client("s3", region_name="us-east-1")
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_bucket_name():
     """Return a test S3 bucket name."""
     return "test-data-api-bucket"
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="module")
 def setup_s3_bucket(s3_client, test_bucket_name):
-    """Create a mocked S3 bucket and upload test files."""
-    s3_client.create_bucket(Bucket=test_bucket_name)
-
-    # Test files for company123, job-to-be-done
-    # Using realistic Twilio-style message IDs (SM + 32 hex chars)
-    s3_client.put_object(
-        Bucket=test_bucket_name,
-        Key="company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_audio.ogg",
-        Body=b"audio_content_1",
-    )
-    s3_client.put_object(
-        Bucket=test_bucket_name,
-        Key="company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_full_text.txt",
-        Body=b"text_content_1",
-    )
-    s3_client.put_object(
-        Bucket=test_bucket_name,
-        Key="company123/job-to-be-done/task2_SM2234567890abcdef1234567890abcdef_audio.ogg",
-        Body=b"audio_content_2",
-    )
+    """Create a mocked S3 bucket and upload test files once per module.
 
-    # Test files for company123, knowledge-document
-    s3_client.put_object(
-        Bucket=test_bucket_name,
-        Key="company123/knowledge-document/doc1_SM3234567890abcdef1234567890abcdef_full_text.txt",
-        Body=b"doc_content_1",
-    )
+    The tests in this module only read from the bucket, so the seeded
+    objects can be shared between them.
+    """
+    s3_client.create_bucket(Bucket=test_bucket_name)
 
-    # Test files for another_company, job-to-be-done
-    s3_client.put_object(
-        Bucket=test_bucket_name,
-        Key="another_company/job-to-be-done/taskA_SM4234567890abcdef1234567890abcdef_audio.ogg",
-        Body=b"audio_content_A",
-    )
+    for key, body in SEED_OBJECTS:
+        s3_client.put_object(Bucket=test_bucket_name, Key=key, Body=body)
 
     yield
     # Moto handles cleanup automatically
 
 
-@pytest.fixture(scope="function")
-def client(test_bucket_name, s3_client): # Add s3_client here
-    """Create a TestClient for the FastAPI app with mocked settings."""
-    # Set environment variables before importing app
-    os.environ["S3_BUCKET_NAME"] = test_bucket_name
-    os.environ["API_KEY"] = ""  # Disable API key for integration tests
-
-    # Import app here to ensure settings are loaded with mocked env vars
-    from data_api_server.main import app
+@pytest.fixture(scope="module")
+def s3_service(test_bucket_name, s3_client):
+    """S3Service backed by the moto-patched client, created once per module."""
     from ai_voice_shared.services.s3_service import S3Service
     from ai_voice_shared.settings import S3Settings
 
@@ -98,10 +80,24 @@ def client(test_bucket_name, s3_client): # Add s3_client here
     mock_s3_service_instance = S3Service(mock_s3_settings)
     mock_s3_service_instance.s3_client = s3_client # Inject the moto-patched client
 
-    with patch("data_api_server.main.s3_service", new=mock_s3_service_instance):
+    # Set environment variables for the app settings, restored after the module
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("S3_BUCKET_NAME", test_bucket_name)
+        mp.setenv("API_KEY", "")  # Disable API key for integration tests
+        yield mock_s3_service_instance
+
+
+@pytest.fixture(scope="function")
+def client(s3_service):
+    """Create a TestClient for the FastAPI app using the moto-backed S3Service."""
+    # Import app here to ensure settings are loaded with mocked env vars
+    from data_api_server.main import app, get_s3_service
+
+    with patch.dict(app.dependency_overrides, {get_s3_service: lambda: s3_service}):
         yield TestClient(app)
 
 
+@pytest.mark.integration
 class TestIntegrationListFiles:
     """Integration tests for the /files/list endpoint."""
 
@@ -115,19 +111,11 @@ class TestIntegrationListFiles:
         assert response.status_code == 200
         data = response.json()
         assert "files" in data
-        assert len(data["files"]) == 3
-        assert any(
-            f["key"] == "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_audio.ogg"
-            for f in data["files"]
-        )
-        assert any(
-            f["key"] == "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_full_text.txt"
-            for f in data["files"]
-        )
-        assert any(
-            f["key"] == "company123/job-to-be-done/task2_SM2234567890abcdef1234567890abcdef_audio.ogg"
-            for f in data["files"]
-        )
+        assert {f["key"] for f in data["files"]} == {
+            "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_audio.ogg",
+            "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_full_text.txt",
+            "company123/job-to-be-done/task2_SM2234567890abcdef1234567890abcdef_audio.ogg",
+        }
         assert data["nextContinuationToken"] is None
 
     def test_list_files_empty_result(self, client, setup_s3_bucket):
@@ -157,6 +145,7 @@ class TestIntegrationListFiles:
         assert data["files"][0]["key"] == "another_company/job-to-be-done/taskA_SM4234567890abcdef1234567890abcdef_audio.ogg"
 
 
+@pytest.mark.integration
 class TestIntegrationGetDownloadUrl:
     """Integration tests for the /files/get-download-url endpoint."""
 
@@ -197,6 +186,7 @@ class TestIntegrationGetDownloadUrl:
         assert response.json()["detail"] == "File not found"
 
 
+@pytest.mark.integration
 class TestIntegrationListFilesWithOutputFormat:
     """Integration tests for the /files/list endpoint with output_format."""
 
@@ -216,19 +206,12 @@ class TestIntegrationListFilesWithOutputFormat:
         assert "message_ids" in data
         assert len(data["message_ids"]) == 2
 
-        # Check message IDs are present
-        message_ids = [msg["message_id"] for msg in data["message_ids"]]
-        assert "SM1234567890abcdef1234567890abcdef" in message_ids
-        assert "SM2234567890abcdef1234567890abcdef" in message_ids
-
-        # Check file counts
-        for msg in data["message_ids"]:
-            if msg["message_id"] == "SM1234567890abcdef1234567890abcdef":
-                assert msg["file_count"] == 2  # audio + full_text
-                assert msg["tag"] == "task1"
-            elif msg["message_id"] == "SM2234567890abcdef1234567890abcdef":
-                assert msg["file_count"] == 1  # audio only
-                assert msg["tag"] == "task2"
+        # Check message IDs, file counts and tags
+        summaries = {msg["message_id"]: (msg["file_count"], msg["tag"]) for msg in data["message_ids"]}
+        assert summaries == {
+            "SM1234567890abcdef1234567890abcdef": (2, "task1"),  # audio + full_text
+            "SM2234567890abcdef1234567890abcdef": (1, "task2"),  # audio only
+        }
 
     def test_list_files_full_format_explicit(self, client, setup_s3_bucket):
         """Test listing files with output_format=full."""
@@ -247,6 +230,7 @@ class TestIntegrationListFilesWithOutputFormat:
         assert len(data["files"]) == 3
 
 
+@pytest.mark.integration
 class TestIntegrationByMessage:
     """Integration tests for the /files/by-message endpoint."""
 
@@ -266,14 +250,13 @@ class TestIntegrationByMessage:
         assert len(data["files"]) == 2  # audio + full_text
 
         # Check file types
-        file_types = [f["type"] for f in data["files"]]
-        assert "audio" in file_types
-        assert "full_text" in file_types
+        assert {f["type"] for f in data["files"]} == {"audio", "full_text"}
 
         # Verify keys are correct
-        keys = [f["key"] for f in data["files"]]
-        assert any("SM1234567890abcdef1234567890abcdef_audio.ogg" in k for k in keys)
-        assert any("SM1234567890abcdef1234567890abcdef_full_text.txt" in k for k in keys)
+        assert {f["key"] for f in data["files"]} == {
+            "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_audio.ogg",
+            "company123/job-to-be-done/task1_SM1234567890abcdef1234567890abcdef_full_text.txt",
+        }
 
     def test_get_files_by_message_different_intent(self, client, setup_s3_bucket):
         """Test retrieval from knowledge-document intent."""
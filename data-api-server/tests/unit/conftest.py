@@ -0,0 +1,45 @@
+"""Shared fixtures for the data API unit tests."""
+
+import os
+from unittest.mock import create_autospec, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ai_voice_shared.services.s3_service import S3Service
+
+# Set environment variables before the app loads its settings
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+os.environ["API_KEY"] = "" # Disable API key for unit tests
+
+from data_api_server.main import app as _app, get_s3_service  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app, built once per test run."""
+    return _app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Create one test client shared by all unit tests."""
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def s3_service_spec():
+    """Autospec of S3Service, built once and reset for each test that uses it."""
+    return create_autospec(S3Service, instance=True)
+
+
+@pytest.fixture
+def mock_s3_service(app, s3_service_spec):
+    """Mock S3Service to avoid external dependencies.
+
+    Tests configure return_value/side_effect on its methods rather than
+    replacing them, so the reset below clears everything a test set.
+    """
+    s3_service_spec.reset_mock(return_value=True, side_effect=True)
+    with patch.dict(app.dependency_overrides, {get_s3_service: lambda: s3_service_spec}):
+        yield s3_service_spec
@@ -1,10 +1,10 @@
 """Tests for API endpoints."""
 
-import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import call
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 
 from ai_voice_shared.models import (
     S3ListResponse,
@@ -14,25 +14,13 @@ from ai_voice_shared.models import (
     MessageArtifactsResponse,
     MessageArtifact,
 )
-# Removed: from data_api_server.main import app
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    # Set environment variables before importing app
-    os.environ["S3_BUCKET_NAME"] = "test-bucket"
-    os.environ["API_KEY"] = "" # Disable API key for unit tests
-
-    from data_api_server.main import app
-    return TestClient(app)
-
-
-@pytest.fixture
-def mock_s3_service():
-    """Mock S3Service to avoid external dependencies."""
-    with patch("data_api_server.main.s3_service") as mock:
-        yield mock
+@pytest_asyncio.fixture
+async def aclient(app):
+    """Async client calling the ASGI app directly on the test's event loop, without TestClient's thread bridge."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
 
 
 class TestHealthEndpoint:
@@ -51,24 +39,22 @@ class TestListFilesEndpoint:
     def test_list_files_success(self, client, mock_s3_service):
         """Test successful listing of files."""
         # Mock response
-        mock_s3_service.list_objects = AsyncMock(
-            return_value=S3ListResponse(
-                files=[
-                    S3ObjectMetadata(
-                        key="company123/job-to-be-done/test_SM123_audio.ogg",
-                        etag='"abc123"',
-                        size=12345,
-                        last_modified="2025-11-05T14:30:01Z",
-                    ),
-                    S3ObjectMetadata(
-                        key="company123/job-to-be-done/test_SM123_full_text.txt",
-                        etag='"def456"',
-                        size=1024,
-                        last_modified="2025-11-05T14:30:02Z",
-                    ),
-                ],
-                nextContinuationToken=None,
-            )
+        mock_s3_service.list_objects.return_value = S3ListResponse(
+            files=[
+                S3ObjectMetadata(
+                    key="company123/job-to-be-done/test_SM123_audio.ogg",
+                    etag='"abc123"',
+                    size=12345,
+                    last_modified="2025-11-05T14:30:01Z",
+                ),
+                S3ObjectMetadata(
+                    key="company123/job-to-be-done/test_SM123_full_text.txt",
+                    etag='"def456"',
+                    size=1024,
+                    last_modified="2025-11-05T14:30:02Z",
+                ),
+            ],
+            nextContinuationToken=None,
         )
 
         response = client.get(
@@ -91,11 +77,9 @@ class TestListFilesEndpoint:
 
     def test_list_files_with_pagination(self, client, mock_s3_service):
         """Test listing with continuation token."""
-        mock_s3_service.list_objects = AsyncMock(
-            return_value=S3ListResponse(
-                files=[],
-                nextContinuationToken="next_token_123",
-            )
+        mock_s3_service.list_objects.return_value = S3ListResponse(
+            files=[],
+            nextContinuationToken="next_token_123",
         )
 
         response = client.get(
@@ -126,50 +110,31 @@ class TestListFilesEndpoint:
         assert response.status_code == 400
         assert "Invalid message_intent" in response.json()["detail"]
 
-    def test_list_files_missing_required_params(self, client):
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},  # Missing both params
+            {"company_id": "company123"},  # Missing message_intent
+            {"message_intent": "job-to-be-done"},  # Missing company_id
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_list_files_missing_required_params(self, aclient, params):
         """Test that missing required params returns 422."""
-        # Missing both params
-        response = client.get("/files/list")
-        assert response.status_code == 422
-
-        # Missing message_intent
-        response = client.get("/files/list", params={"company_id": "company123"})
-        assert response.status_code == 422
-
-        # Missing company_id
-        response = client.get(
-            "/files/list", params={"message_intent": "job-to-be-done"}
-        )
+        response = await aclient.get("/files/list", params=params)
         assert response.status_code == 422
 
-    def test_list_files_s3_error(self, client, mock_s3_service):
-        """Test that S3 errors return 500."""
-        mock_s3_service.list_objects = AsyncMock(
-            side_effect=Exception("S3 connection failed")
-        )
+    @pytest.mark.parametrize("intent", ["job-to-be-done", "knowledge-document", "other"])
+    @pytest.mark.asyncio
+    async def test_list_files_all_valid_intents(self, aclient, mock_s3_service, intent):
+        """Test all three valid message intents."""
+        mock_s3_service.list_objects.return_value = S3ListResponse(files=[], nextContinuationToken=None)
 
-        response = client.get(
+        response = await aclient.get(
             "/files/list",
-            params={"company_id": "company123", "message_intent": "job-to-be-done"},
-        )
-
-        assert response.status_code == 500
-        assert response.json()["detail"] == "Internal server error"
-
-    def test_list_files_all_valid_intents(self, client, mock_s3_service):
-        """Test all three valid message intents."""
-        mock_s3_service.list_objects = AsyncMock(
-            return_value=S3ListResponse(files=[], nextContinuationToken=None)
+            params={"company_id": "test_company", "message_intent": intent},
         )
-
-        valid_intents = ["job-to-be-done", "knowledge-document", "other"]
-
-        for intent in valid_intents:
-            response = client.get(
-                "/files/list",
-                params={"company_id": "test_company", "message_intent": intent},
-            )
-            assert response.status_code == 200
+        assert response.status_code == 200
 
 
 class TestGetDownloadUrlEndpoint:
@@ -177,14 +142,10 @@ class TestGetDownloadUrlEndpoint:
 
     def test_get_download_url_success(self, client, mock_s3_service):
         """Test successful presigned URL generation."""
-        mock_s3_service.generate_presigned_url = AsyncMock(
-            return_value="https://s3.amazonaws.com/bucket/key?presigned=params"
-        )
+        mock_s3_service.generate_presigned_url.return_value = "https://s3.amazonaws.com/bucket/key?presigned=params"
 
-        response = client.get(
-            "/files/get-download-url",
-            params={"key": "company123%2Fjob-to-be-done%2Ftest_SM123_audio.ogg"},
-        )
+        # The key is sent already URL-encoded, as in the README's curl example
+        response = client.get("/files/get-download-url?key=company123%2Fjob-to-be-done%2Ftest_SM123_audio.ogg")
 
         assert response.status_code == 200
         assert response.json()["url"] == "https://s3.amazonaws.com/bucket/key?presigned=params"
@@ -194,80 +155,71 @@ class TestGetDownloadUrlEndpoint:
             "company123/job-to-be-done/test_SM123_audio.ogg"
         )
 
-    def test_get_download_url_file_not_found(self, client, mock_s3_service):
-        """Test that non-existent file returns 404."""
-        mock_s3_service.generate_presigned_url = AsyncMock(
-            side_effect=ValueError("Object not found")
-        )
-
-        response = client.get(
-            "/files/get-download-url",
-            params={"key": "company123%2Fnonexistent.ogg"},
-        )
-
-        assert response.status_code == 404
-        assert response.json()["detail"] == "File not found"
-
-    def test_get_download_url_s3_error(self, client, mock_s3_service):
-        """Test that S3 errors return 500."""
-        mock_s3_service.generate_presigned_url = AsyncMock(
-            side_effect=Exception("S3 connection failed")
-        )
-
-        response = client.get(
-            "/files/get-download-url",
-            params={"key": "company123%2Ftest.ogg"},
-        )
-
-        assert response.status_code == 500
-        assert response.json()["detail"] == "Internal server error"
-
     def test_get_download_url_missing_key(self, client):
         """Test that missing key param returns 422."""
         response = client.get("/files/get-download-url")
         assert response.status_code == 422
 
-    def test_get_download_url_special_chars(self, client, mock_s3_service):
+    @pytest.mark.parametrize(
+        ("encoded_key", "expected_key"),
+        [
+            # Spaces and ampersand
+            (
+                "company%20123/job-to-be-done/test%20file%20%26%20stuff.ogg",
+                "company 123/job-to-be-done/test file & stuff.ogg",
+            ),
+            # Plus sign and non-ASCII characters
+            (
+                "company123/other/caf%C3%A9%2Bmenu.ogg",
+                "company123/other/caf\u00e9+menu.ogg",
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_get_download_url_special_chars(self, aclient, mock_s3_service, encoded_key, expected_key):
         """Test URL decoding with special characters."""
-        mock_s3_service.generate_presigned_url = AsyncMock(
-            return_value="https://s3.amazonaws.com/bucket/key"
-        )
+        mock_s3_service.generate_presigned_url.return_value = "https://s3.amazonaws.com/bucket/key"
 
-        # Test with spaces and special chars
-        encoded_key = "company%20123/job-to-be-done/test%20file%20%26%20stuff.ogg"
-        response = client.get(
-            "/files/get-download-url",
-            params={"key": encoded_key},
-        )
+        response = await aclient.get(f"/files/get-download-url?key={encoded_key}")
 
         assert response.status_code == 200
 
         # Verify the decoded key was passed to S3Service
-        expected_key = "company 123/job-to-be-done/test file & stuff.ogg"
         mock_s3_service.generate_presigned_url.assert_called_once_with(expected_key)
 
+    def test_get_download_url_unencoded_key(self, client, mock_s3_service):
+        """Test that encoded and already-decoded keys resolve to the same S3 key."""
+        mock_s3_service.generate_presigned_url.return_value = "https://s3.amazonaws.com/bucket/key"
+
+        for key in ("company123%2Fjob-to-be-done%2Ftest.ogg", "company123/job-to-be-done/test.ogg"):
+            response = client.get("/files/get-download-url", params={"key": key})
+            assert response.status_code == 200
+
+        assert mock_s3_service.generate_presigned_url.call_args_list == [
+            call("company123/job-to-be-done/test.ogg"),
+            call("company123/job-to-be-done/test.ogg"),
+        ]
+
 
 class TestListFilesWithOutputFormat:
     """Tests for /files/list endpoint with output_format parameter."""
 
     def test_list_files_with_ids_format(self, client, mock_s3_service):
         """Test listing with output_format=ids."""
-        mock_s3_service.list_objects_ids_only = AsyncMock(
-            return_value=S3ListIdsResponse(
-                message_ids=[
-                    MessageIdSummary(
-                        message_id="SM123456",
-                        tag="bathroom-renovation",
-                        file_count=3,
-                    ),
-                    MessageIdSummary(
-                        message_id="SM789012",
-                        tag="leak-repair",
-                        file_count=2,
-                    ),
-                ],
-                nextContinuationToken=None,
-            )
+        mock_s3_service.list_objects_ids_only.return_value = S3ListIdsResponse(
+            message_ids=[
+                MessageIdSummary(
+                    message_id="SM123456",
+                    tag="bathroom-renovation",
+                    file_count=3,
+                ),
+                MessageIdSummary(
+                    message_id="SM789012",
+                    tag="leak-repair",
+                    file_count=2,
+                ),
+            ],
+            nextContinuationToken=None,
         )
 
         response = client.get(
@@ -296,18 +248,16 @@ class TestListFilesWithOutputFormat:
 
     def test_list_files_with_full_format(self, client, mock_s3_service):
         """Test listing with output_format=full (default behavior)."""
-        mock_s3_service.list_objects = AsyncMock(
-            return_value=S3ListResponse(
-                files=[
-                    S3ObjectMetadata(
-                        key="company123/job-to-be-done/test_SM123_audio.ogg",
-                        etag='"abc123"',
-                        size=12345,
-                        last_modified="2025-11-05T14:30:01Z",
-                    )
-                ],
-                nextContinuationToken=None,
-            )
+        mock_s3_service.list_objects.return_value = S3ListResponse(
+            files=[
+                S3ObjectMetadata(
+                    key="company123/job-to-be-done/test_SM123_audio.ogg",
+                    etag='"abc123"',
+                    size=12345,
+                    last_modified="2025-11-05T14:30:01Z",
+                )
+            ],
+            nextContinuationToken=None,
         )
 
         response = client.get(
@@ -324,29 +274,19 @@ class TestListFilesWithOutputFormat:
         assert "files" in data
         assert len(data["files"]) == 1
 
-        mock_s3_service.list_objects.assert_called_once_with(
-            company_id="company123",
-            message_intent="job-to-be-done",
-            continuation_token=None,
-        )
-
     def test_list_files_default_format(self, client, mock_s3_service):
         """Test that default output_format is 'full'."""
-        mock_s3_service.list_objects = AsyncMock(
-            return_value=S3ListResponse(files=[], nextContinuationToken=None)
-        )
+        mock_s3_service.list_objects.return_value = S3ListResponse(files=[], nextContinuationToken=None)
 
         response = client.get(
             "/files/list",
             params={"company_id": "company123", "message_intent": "job-to-be-done"},
         )
 
+        # A "files" body can only come from list_objects (not list_objects_ids_only)
         assert response.status_code == 200
         assert "files" in response.json()
 
-        # Should call list_objects (not list_objects_ids_only)
-        mock_s3_service.list_objects.assert_called_once()
-
     def test_list_files_invalid_format(self, client):
         """Test that invalid output_format returns 400."""
         response = client.get(
@@ -367,36 +307,34 @@ class TestByMessageEndpoint:
 
     def test_get_files_by_message_success(self, client, mock_s3_service):
         """Test successful retrieval of message artifacts."""
-        mock_s3_service.list_files_by_message_id = AsyncMock(
-            return_value=MessageArtifactsResponse(
-                message_id="SM123456",
-                company_id="company123",
-                intent="job-to-be-done",
-                tag="bathroom-renovation",
-                files=[
-                    MessageArtifact(
-                        key="company123/job-to-be-done/bathroom-renovation_SM123456_audio.ogg",
-                        type="audio",
-                        etag='"abc123"',
-                        size=123456,
-                        last_modified="2025-11-05T14:30:01Z",
-                    ),
-                    MessageArtifact(
-                        key="company123/job-to-be-done/bathroom-renovation_SM123456_full_text.txt",
-                        type="full_text",
-                        etag='"def456"',
-                        size=1024,
-                        last_modified="2025-11-05T14:30:02Z",
-                    ),
-                    MessageArtifact(
-                        key="company123/job-to-be-done/bathroom-renovation_SM123456.text_summary.txt",
-                        type="text_summary",
-                        etag='"ghi789"',
-                        size=512,
-                        last_modified="2025-11-05T14:30:03Z",
-                    ),
-                ],
-            )
+        mock_s3_service.list_files_by_message_id.return_value = MessageArtifactsResponse(
+            message_id="SM123456",
+            company_id="company123",
+            intent="job-to-be-done",
+            tag="bathroom-renovation",
+            files=[
+                MessageArtifact(
+                    key="company123/job-to-be-done/bathroom-renovation_SM123456_audio.ogg",
+                    type="audio",
+                    etag='"abc123"',
+                    size=123456,
+                    last_modified="2025-11-05T14:30:01Z",
+                ),
+                MessageArtifact(
+                    key="company123/job-to-be-done/bathroom-renovation_SM123456_full_text.txt",
+                    type="full_text",
+                    etag='"def456"',
+                    size=1024,
+                    last_modified="2025-11-05T14:30:02Z",
+                ),
+                MessageArtifact(
+                    key="company123/job-to-be-done/bathroom-renovation_SM123456.text_summary.txt",
+                    type="text_summary",
+                    etag='"ghi789"',
+                    size=512,
+                    last_modified="2025-11-05T14:30:03Z",
+                ),
+            ],
         )
 
         response = client.get(
@@ -420,18 +358,6 @@ class TestByMessageEndpoint:
             message_id="SM123456",
         )
 
-    def test_get_files_by_message_not_found(self, client, mock_s3_service):
-        """Test that non-existent message returns 404."""
-        mock_s3_service.list_files_by_message_id = AsyncMock(return_value=None)
-
-        response = client.get(
-            "/files/by-message",
-            params={"company_id": "company123", "message_id": "SM999999"},
-        )
-
-        assert response.status_code == 404
-        assert "No artifacts found" in response.json()["detail"]
-
     def test_get_files_by_message_missing_params(self, client):
         """Test that missing required params returns 422."""
         # Missing both params
@@ -446,16 +372,131 @@ class TestByMessageEndpoint:
         response = client.get("/files/by-message", params={"message_id": "SM123456"})
         assert response.status_code == 422
 
-    def test_get_files_by_message_s3_error(self, client, mock_s3_service):
-        """Test that S3 errors return 500."""
-        mock_s3_service.list_files_by_message_id = AsyncMock(
-            side_effect=Exception("S3 connection failed")
+
+class TestErrorResponses:
+    """Tests for not-found and S3 error responses across the GET file endpoints."""
+
+    @pytest.mark.parametrize(
+        ("url", "service_method", "mock_config", "expected_status", "expected_detail"),
+        [
+            (
+                "/files/list?company_id=company123&message_intent=job-to-be-done",
+                "list_objects",
+                {"side_effect": Exception("S3 connection failed")},
+                500,
+                "Internal server error",
+            ),
+            (
+                "/files/get-download-url?key=company123%2Ftest.ogg",
+                "generate_presigned_url",
+                {"side_effect": ValueError("Object not found")},
+                404,
+                "File not found",
+            ),
+            (
+                "/files/get-download-url?key=company123%2Ftest.ogg",
+                "generate_presigned_url",
+                {"side_effect": Exception("S3 connection failed")},
+                500,
+                "Internal server error",
+            ),
+            (
+                "/files/by-message?company_id=company123&message_id=SM123456",
+                "list_files_by_message_id",
+                {"return_value": None},
+                404,
+                "No artifacts found for message SM123456",
+            ),
+            (
+                "/files/by-message?company_id=company123&message_id=SM123456",
+                "list_files_by_message_id",
+                {"side_effect": Exception("S3 connection failed")},
+                500,
+                "Internal server error",
+            ),
+        ],
+        ids=[
+            "list_s3_error",
+            "download_url_file_not_found",
+            "download_url_s3_error",
+            "by_message_not_found",
+            "by_message_s3_error",
+        ],
+    )
+    def test_error_response(
+        self, client, mock_s3_service, url, service_method, mock_config, expected_status, expected_detail
+    ):
+        """Test that missing objects return 404 and other S3 errors return 500."""
+        getattr(mock_s3_service, service_method).configure_mock(**mock_config)
+
+        response = client.get(url)
+
+        assert response.status_code == expected_status
+        assert response.json()["detail"] == expected_detail
+
+
+class TestBatchByMessageEndpoint:
+    """Tests for /files/by-messages endpoint."""
+
+    def test_get_files_by_messages_success(self, client, mock_s3_service):
+        """Test artifacts are returned per message, with null for messages without artifacts."""
+        artifacts = MessageArtifactsResponse(
+            message_id="SM123456",
+            company_id="company123",
+            intent="job-to-be-done",
+            tag="bathroom-renovation",
+            files=[
+                MessageArtifact(
+                    key="company123/job-to-be-done/bathroom-renovation_SM123456_audio.ogg",
+                    type="audio",
+                    etag='"abc123"',
+                    size=123456,
+                    last_modified="2025-11-05T14:30:01Z",
+                ),
+            ],
         )
+        mock_s3_service.list_files_by_message_id.side_effect = [artifacts, None]
 
-        response = client.get(
-            "/files/by-message",
-            params={"company_id": "company123", "message_id": "SM123456"},
+        response = client.post(
+            "/files/by-messages",
+            json={"company_id": "company123", "message_ids": ["SM123456", "SM999999", "SM123456"]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["company_id"] == "company123"
+        assert list(data["messages"]) == ["SM123456", "SM999999"]
+        assert data["messages"]["SM123456"]["tag"] == "bathroom-renovation"
+        assert data["messages"]["SM999999"] is None
+
+        # Duplicate IDs are looked up once
+        assert mock_s3_service.list_files_by_message_id.call_args_list == [
+            call(company_id="company123", message_id="SM123456"),
+            call(company_id="company123", message_id="SM999999"),
+        ]
+
+    def test_get_files_by_messages_s3_error(self, client, mock_s3_service):
+        """Test that S3 errors return 500."""
+        mock_s3_service.list_files_by_message_id.side_effect = Exception("S3 connection failed")
+
+        response = client.post(
+            "/files/by-messages",
+            json={"company_id": "company123", "message_ids": ["SM123456"]},
         )
 
         assert response.status_code == 500
         assert response.json()["detail"] == "Internal server error"
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"message_ids": ["SM123456"]},
+            {"company_id": "company123", "message_ids": []},
+            {"company_id": "company123", "message_ids": [f"SM{i}" for i in range(101)]},
+        ],
+        ids=["missing_company_id", "empty_message_ids", "too_many_message_ids"],
+    )
+    def test_get_files_by_messages_invalid_body(self, client, body):
+        """Test that invalid bodies return 422."""
+        response = client.post("/files/by-messages", json=body)
+        assert response.status_code == 422
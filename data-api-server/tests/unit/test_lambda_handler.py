@@ -0,0 +1,228 @@
+"""Tests for the framework-free Lambda handler."""
+
+import base64
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ai_voice_shared.models import (
+    S3ListResponse,
+    S3ObjectMetadata,
+    MessageArtifactsResponse,
+    MessageArtifact,
+)
+
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+
+from data_api_server.lambda_handler import handler  # noqa: E402
+
+
+def make_event(path: str, query: str = "", method: str = "GET") -> dict:
+    """Build a minimal API Gateway HTTP API (v2) event."""
+    return {
+        "rawPath": f"/dev{path}",
+        "rawQueryString": query,
+        "requestContext": {"http": {"method": method, "path": f"/dev{path}"}},
+    }
+
+
+@pytest.fixture
+def mock_s3_service():
+    """Mock S3Service returned by the lazy dependency getter."""
+    mock = MagicMock()
+    with patch("data_api_server.dependencies.get_s3_service", return_value=mock):
+        yield mock
+
+
+class TestHealth:
+    """Tests for the health route."""
+
+    def test_health_check(self):
+        """Test health check is answered without touching S3."""
+        with patch("data_api_server.dependencies.get_s3_service") as mock_get_s3_service:
+            response = handler(make_event("/health"), None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"status": "healthy"}
+        mock_get_s3_service.assert_not_called()
+
+    def test_health_check_does_not_import_file_operations(self):
+        """Test that a cold health check does not load the S3 and model modules."""
+        code = (
+            "import sys; import data_api_server.lambda_handler as h; "
+            "h.handler({'rawPath': '/dev/health'}, None); "
+            "print(any(m in sys.modules for m in ('data_api_server.files', 'boto3', 'pydantic')))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "False"
+
+
+class TestRouting:
+    """Tests for path and method dispatch."""
+
+    def test_unknown_path_returns_404(self):
+        """Test that unknown paths return 404."""
+        response = handler(make_event("/files/unknown"), None)
+
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == {"detail": "Not Found"}
+
+    def test_wrong_method_returns_405(self):
+        """Test that non-GET requests to file routes return 405."""
+        response = handler(make_event("/files/list", method="POST"), None)
+
+        assert response["statusCode"] == 405
+
+    def test_missing_required_params_returns_422(self):
+        """Test that missing required query parameters return 422."""
+        response = handler(make_event("/files/list", "company_id=company123"), None)
+
+        assert response["statusCode"] == 422
+        detail = json.loads(response["body"])["detail"]
+        assert [error["loc"] for error in detail] == [["query", "message_intent"]]
+
+
+class TestFileRoutes:
+    """Tests for the file routes."""
+
+    def test_list_files(self, mock_s3_service):
+        """Test listing files returns the serialized S3 response."""
+        mock_s3_service.list_objects = AsyncMock(
+            return_value=S3ListResponse(
+                files=[
+                    S3ObjectMetadata(
+                        key="company123/job-to-be-done/test_SM123_audio.ogg",
+                        etag='"abc123"',
+                        size=12345,
+                        last_modified="2025-11-05T14:30:01Z",
+                    )
+                ],
+                nextContinuationToken="token123",
+            )
+        )
+
+        response = handler(
+            make_event("/files/list", "company_id=company123&message_intent=job-to-be-done&nextContinuationToken=abc"),
+            None,
+        )
+
+        assert response["statusCode"] == 200
+        assert response["headers"]["content-type"] == "application/json"
+        data = json.loads(response["body"])
+        assert data["files"][0]["key"] == "company123/job-to-be-done/test_SM123_audio.ogg"
+        assert data["nextContinuationToken"] == "token123"
+        mock_s3_service.list_objects.assert_called_once_with(
+            company_id="company123",
+            message_intent="job-to-be-done",
+            continuation_token="abc",
+        )
+
+    def test_list_files_invalid_intent(self, mock_s3_service):
+        """Test invalid message_intent returns 400."""
+        response = handler(make_event("/files/list", "company_id=company123&message_intent=invalid"), None)
+
+        assert response["statusCode"] == 400
+        assert "Invalid message_intent" in json.loads(response["body"])["detail"]
+
+    def test_get_files_by_message_not_found(self, mock_s3_service):
+        """Test unknown message returns 404."""
+        mock_s3_service.list_files_by_message_id = AsyncMock(return_value=None)
+
+        response = handler(make_event("/files/by-message", "company_id=company123&message_id=SM999"), None)
+
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == {"detail": "No artifacts found for message SM999"}
+
+    def test_get_files_by_message(self, mock_s3_service):
+        """Test artifacts for a message are returned."""
+        mock_s3_service.list_files_by_message_id = AsyncMock(
+            return_value=MessageArtifactsResponse(
+                message_id="SM123",
+                company_id="company123",
+                intent="job-to-be-done",
+                tag="task1",
+                files=[
+                    MessageArtifact(
+                        key="company123/job-to-be-done/task1_SM123_audio.ogg",
+                        type="audio",
+                        etag='"abc"',
+                        size=100,
+                        last_modified="2025-11-05T14:30:01Z",
+                    )
+                ],
+            )
+        )
+
+        response = handler(make_event("/files/by-message", "company_id=company123&message_id=SM123"), None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"])["files"][0]["type"] == "audio"
+
+    def test_get_files_by_messages(self, mock_s3_service):
+        """Test the batch route reads message IDs from the JSON body."""
+        mock_s3_service.list_files_by_message_id = AsyncMock(return_value=None)
+        event = make_event("/files/by-messages", method="POST")
+        event["body"] = base64.b64encode(b'{"company_id":"company123","message_ids":["SM1","SM2"]}').decode()
+        event["isBase64Encoded"] = True
+
+        response = handler(event, None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"company_id": "company123", "messages": {"SM1": None, "SM2": None}}
+        assert mock_s3_service.list_files_by_message_id.await_count == 2
+
+    def test_get_files_by_messages_invalid_body_returns_422(self):
+        """Test that body validation errors are reported under the body location."""
+        event = make_event("/files/by-messages", method="POST")
+        event["body"] = '{"message_ids":["SM1"]}'
+
+        response = handler(event, None)
+
+        assert response["statusCode"] == 422
+        detail = json.loads(response["body"])["detail"]
+        assert [error["loc"] for error in detail] == [["body", "company_id"]]
+
+    def test_get_files_by_messages_invalid_base64_returns_422(self):
+        """Test that a body marked as base64 that does not decode is rejected under the body location."""
+        event = make_event("/files/by-messages", method="POST")
+        event["body"] = "abc"
+        event["isBase64Encoded"] = True
+
+        response = handler(event, None)
+
+        assert response["statusCode"] == 422
+        detail = json.loads(response["body"])["detail"]
+        assert [error["loc"] for error in detail] == [["body"]]
+
+    def test_get_files_by_messages_requires_post(self):
+        """Test that GET requests to the batch route return 405."""
+        response = handler(make_event("/files/by-messages"), None)
+
+        assert response["statusCode"] == 405
+
+    def test_get_download_url_decodes_key(self, mock_s3_service):
+        """Test the URL-encoded key is decoded before generating the presigned URL."""
+        mock_s3_service.generate_presigned_url = AsyncMock(return_value="https://s3.example.com/file")
+
+        response = handler(
+            make_event("/files/get-download-url", "key=company123%252Fjob-to-be-done%252Ftest.ogg"),
+            None,
+        )
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"url": "https://s3.example.com/file"}
+        mock_s3_service.generate_presigned_url.assert_called_once_with("company123/job-to-be-done/test.ogg")
+
+    def test_get_download_url_s3_error(self, mock_s3_service):
+        """Test unexpected S3 errors return 500."""
+        mock_s3_service.generate_presigned_url = AsyncMock(side_effect=Exception("S3 error"))
+
+        response = handler(make_event("/files/get-download-url", "key=test.ogg"), None)
+
+        assert response["statusCode"] == 500
+        assert json.loads(response["body"]) == {"detail": "Internal server error"}
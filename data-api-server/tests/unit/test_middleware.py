@@ -1,155 +1,122 @@
 """Tests for API middleware."""
 
-import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock
 
-from fastapi.testclient import TestClient
+import pytest
+
+from ai_voice_shared.models import S3ListResponse
+
+# Request inputs shared by the tests below
+API_KEY = "secret-key-123"
+LIST_PARAMS = {"company_id": "test", "message_intent": "job-to-be-done"}
+
+
+@pytest.fixture
+def mock_settings(monkeypatch):
+    """Replace the app settings; each test sets api_key as needed."""
+    settings = MagicMock()
+    monkeypatch.setattr("data_api_server.main.get_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def mock_s3_service(mock_s3_service):
+    """Mock S3Service returning an empty listing."""
+    mock_s3_service.list_objects.return_value = S3ListResponse(files=[], nextContinuationToken=None)
+    return mock_s3_service
 
 
 class TestAPIKeyMiddleware:
     """Tests for API key validation middleware."""
 
-    def test_health_check_bypasses_auth(self):
+    def test_health_check_bypasses_auth(self, client, mock_settings):
         """Test that health check works without API key."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        # Import here to ensure fresh app instance with API key
-        from data_api_server.main import app
+        mock_settings.api_key = API_KEY
 
-        with patch("data_api_server.main.settings") as mock_settings:
-            mock_settings.api_key = "secret-key-123"
-            client = TestClient(app)
+        # Health check should work without API key
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
 
-            # Health check should work without API key
-            response = client.get("/health")
-            assert response.status_code == 200
-            assert response.json() == {"status": "healthy"}
-
-    def test_endpoints_require_api_key_when_configured(self):
+    def test_endpoints_require_api_key_when_configured(self, client, mock_settings):
         """Test that endpoints require API key when it's configured."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            mock_settings.api_key = "secret-key-123"
-            client = TestClient(app)
-
-            # Request without API key should return 403
-            response = client.get(
-                "/files/list",
-                params={"company_id": "test", "message_intent": "job-to-be-done"},
-            )
-            assert response.status_code == 403
-            assert response.json()["message"] == "Forbidden"
-
-    def test_endpoints_accept_valid_api_key(self):
+        mock_settings.api_key = API_KEY
+
+        # Request without API key should return 403
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+        )
+        assert response.status_code == 403
+        assert response.json()["message"] == "Forbidden"
+
+    @pytest.mark.usefixtures("mock_s3_service")
+    def test_endpoints_accept_valid_api_key(self, client, mock_settings):
         """Test that endpoints accept valid API key."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            with patch("data_api_server.main.s3_service") as mock_s3:
-                from ai_voice_shared.models import S3ListResponse
+        mock_settings.api_key = API_KEY
 
-                mock_settings.api_key = "secret-key-123"
-                mock_s3.list_objects = AsyncMock(
-                    return_value=S3ListResponse(files=[], nextContinuationToken=None)
-                )
+        # Request with valid API key should succeed
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+            headers={"x-api-key": API_KEY},
+        )
+        assert response.status_code == 200
 
-                client = TestClient(app)
-
-                # Request with valid API key should succeed
-                response = client.get(
-                    "/files/list",
-                    params={"company_id": "test", "message_intent": "job-to-be-done"},
-                    headers={"x-api-key": "secret-key-123"},
-                )
-                assert response.status_code == 200
-
-    def test_endpoints_reject_invalid_api_key(self):
+    def test_endpoints_reject_invalid_api_key(self, client, mock_settings):
         """Test that endpoints reject invalid API key."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            mock_settings.api_key = "secret-key-123"
-            client = TestClient(app)
-
-            # Request with wrong API key should return 403
-            response = client.get(
-                "/files/list",
-                params={"company_id": "test", "message_intent": "job-to-be-done"},
-                headers={"x-api-key": "wrong-key"},
-            )
-            assert response.status_code == 403
-            assert response.json()["message"] == "Forbidden"
-
-    def test_no_auth_when_api_key_not_configured(self):
+        mock_settings.api_key = API_KEY
+
+        # Request with wrong API key should return 403
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+            headers={"x-api-key": "wrong-key"},
+        )
+        assert response.status_code == 403
+        assert response.json()["message"] == "Forbidden"
+
+    @pytest.mark.usefixtures("mock_s3_service")
+    def test_no_auth_when_api_key_not_configured(self, client, mock_settings):
         """Test that authentication is skipped when API key is None."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            with patch("data_api_server.main.s3_service") as mock_s3:
-                from ai_voice_shared.models import S3ListResponse
-
-                # API key is None (not configured)
-                mock_settings.api_key = None
-                mock_s3.list_objects = AsyncMock(
-                    return_value=S3ListResponse(files=[], nextContinuationToken=None)
-                )
-
-                client = TestClient(app)
-
-                # Request without API key should succeed when auth is disabled
-                response = client.get(
-                    "/files/list",
-                    params={"company_id": "test", "message_intent": "job-to-be-done"},
-                )
-                assert response.status_code == 200
-
-    def test_case_sensitive_header_name(self):
+        # API key is None (not configured)
+        mock_settings.api_key = None
+
+        # Request without API key should succeed when auth is disabled
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.usefixtures("mock_s3_service")
+    def test_case_sensitive_header_name(self, client, mock_settings):
         """Test that x-api-key header is case-sensitive (lowercase)."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            with patch("data_api_server.main.s3_service") as mock_s3:
-                from ai_voice_shared.models import S3ListResponse
-
-                mock_settings.api_key = "secret-key-123"
-                mock_s3.list_objects = AsyncMock(
-                    return_value=S3ListResponse(files=[], nextContinuationToken=None)
-                )
-                client = TestClient(app)
-
-                # FastAPI/Starlette normalizes headers to lowercase, so this should work
-                response = client.get(
-                    "/files/list",
-                    params={"company_id": "test", "message_intent": "job-to-be-done"},
-                    headers={"X-API-KEY": "secret-key-123"},  # Uppercase
-                )
-                # Should work due to header normalization
-                assert response.status_code == 200
-
-    def test_multiple_endpoints_protected(self):
+        mock_settings.api_key = API_KEY
+
+        # FastAPI/Starlette normalizes headers to lowercase, so this should work
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+            headers={"X-API-KEY": API_KEY},  # Uppercase
+        )
+        # Should work due to header normalization
+        assert response.status_code == 200
+
+    def test_multiple_endpoints_protected(self, client, mock_settings):
         """Test that all endpoints (except health) are protected."""
-        os.environ["S3_BUCKET_NAME"] = "test-bucket" # Set for Settings initialization
-        from data_api_server.main import app
-
-        with patch("data_api_server.main.settings") as mock_settings:
-            mock_settings.api_key = "secret-key-123"
-            client = TestClient(app)
-
-            # Test /files/list
-            response = client.get(
-                "/files/list",
-                params={"company_id": "test", "message_intent": "job-to-be-done"},
-            )
-            assert response.status_code == 403
-
-            # Test /files/get-download-url
-            response = client.get(
-                "/files/get-download-url",
-                params={"key": "test.ogg"},
-            )
-            assert response.status_code == 403
+        mock_settings.api_key = API_KEY
+
+        # Test /files/list
+        response = client.get(
+            "/files/list",
+            params=LIST_PARAMS,
+        )
+        assert response.status_code == 403
+
+        # Test /files/get-download-url
+        response = client.get(
+            "/files/get-download-url",
+            params={"key": "test.ogg"},
+        )
+        assert response.status_code == 403
@@ -0,0 +1,50 @@
+"""In-memory cache with per-entry expiry, shared by the services that reuse API results."""
+
+import time
+from typing import Generic, Hashable, Iterator, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Dict-backed cache whose entries expire after a per-entry TTL.
+
+    Expiry uses the monotonic clock. When the cache is full, expired entries are
+    evicted first and then the oldest entry, so memory stays bounded on a
+    long-lived Lambda container.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key -> (value, monotonic time after which it is no longer served)
+        self._entries: dict[K, tuple[V, float]] = {}
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for a key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return None
+
+    def set(self, key: K, value: V, ttl_seconds: float) -> None:
+        """Store a value for ttl_seconds, evicting expired or oldest entries when the cache is full."""
+        entries = self._entries
+        if key not in entries and len(entries) >= self.max_size:
+            now = time.monotonic()
+            for stale_key in [k for k, (_, until) in entries.items() if until <= now]:
+                del entries[stale_key]
+            if len(entries) >= self.max_size:
+                del entries[next(iter(entries))]
+        entries[key] = (value, time.monotonic() + ttl_seconds)
+
+    def pop(self, key: K) -> None:
+        """Remove a key if it is cached."""
+        self._entries.pop(key, None)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,7 +1,7 @@
 """Shared data models for AI Voice Tool services."""
 
 from typing import Optional, Literal
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
 
 
 class CustomerMetadata(BaseModel):
@@ -63,6 +63,35 @@ class MessageArtifactsResponse(BaseModel):
     files: list[MessageArtifact]
 
 
+# Upper bound on message IDs per batch request, keeping the concurrent S3 lookups bounded
+MAX_BATCH_MESSAGE_IDS = 100
+
+
+class BatchMessagesRequest(BaseModel):
+    """Request for the artifacts of several messages of one company."""
+
+    company_id: str
+    message_ids: list[str] = Field(min_length=1, max_length=MAX_BATCH_MESSAGE_IDS)
+
+
+class BatchMessageArtifactsResponse(BaseModel):
+    """Response containing the artifacts for each requested message."""
+
+    company_id: str
+    messages: dict[str, MessageArtifactsResponse | None]  # None if no artifacts were found
+
+
+# Twilio MessageType values that map directly to our message types
+_KNOWN_MESSAGE_TYPES = frozenset({"text", "audio", "image", "video", "document"})
+
+# Message type for the top-level MIME type of a media attachment; anything else is a document
+_MEDIA_TYPE_TO_MESSAGE_TYPE: dict[str, Literal["audio", "image", "video"]] = {
+    "audio": "audio",
+    "image": "image",
+    "video": "video",
+}
+
+
 class TwilioWebhookPayload(BaseModel):
     """Twilio WhatsApp webhook payload.
 
@@ -87,7 +116,7 @@ class TwilioWebhookPayload(BaseModel):
     MessageType: Optional[str] = None
 
     # Media information
-    NumMedia: str = "0"  # String number of media attachments
+    NumMedia: int = 0  # Twilio sends a string; coerced to int at validation
     MediaContentType0: Optional[str] = None
     MediaUrl0: Optional[str] = None
     MediaContentType1: Optional[str] = None
@@ -100,38 +129,49 @@ class TwilioWebhookPayload(BaseModel):
     ReferralNumMedia: Optional[str] = None
     ChannelMetadata: Optional[str] = None
 
-    model_config = ConfigDict(extra="allow")
+    # Frozen: the payload is never changed after parsing, and frozen models are hashable
+    model_config = ConfigDict(extra="allow", frozen=True)
+
+    # Parsed once at validation time instead of in every accessor call
+    _media_content_type0: str = PrivateAttr(default="")
+
+    @field_validator("NumMedia", mode="before")
+    @classmethod
+    def _blank_num_media_is_zero(cls, value: object) -> object:
+        # Form bodies are parsed with blank values kept, so NumMedia= must not fail validation
+        return 0 if value == "" else value
+
+    @model_validator(mode="after")
+    def _parse_media_fields(self) -> "TwilioWebhookPayload":
+        self._media_content_type0 = (self.MediaContentType0 or "").lower()
+        return self
 
     def get_message_type(self) -> Literal["text", "audio", "image", "video", "document", "unknown"]:
         """Determine message type based on media content type."""
         if self.MessageType:
             # Map Twilio's MessageType to our internal types
             msg_type = self.MessageType.lower()
-            if msg_type in ["text", "audio", "image", "video", "document"]:
+            if msg_type in _KNOWN_MESSAGE_TYPES:
                 return msg_type
             if msg_type == "file":  # Twilio might use 'file'
                 return "document"
 
         # Fallback for older webhook formats
-        if int(self.NumMedia) == 0:
+        if self.NumMedia == 0:
             return "text"
 
-        if self.MediaContentType0:
-            content_type = self.MediaContentType0.lower()
-            if content_type.startswith("audio/"):
-                return "audio"
-            elif content_type.startswith("image/"):
-                return "image"
-            elif content_type.startswith("video/"):
-                return "video"
-            else:
-                return "document"
+        if self._media_content_type0:
+            # Media type is the part before "/", e.g. "audio" in "audio/ogg"
+            media_type, separator, _ = self._media_content_type0.partition("/")
+            if separator:
+                return _MEDIA_TYPE_TO_MESSAGE_TYPE.get(media_type, "document")
+            return "document"
 
         return "unknown"
 
     def get_media_url(self) -> Optional[str]:
         """Extract the first media URL (typically for audio messages)."""
-        if int(self.NumMedia) > 0:
+        if self.NumMedia > 0:
             return self.MediaUrl0
         return None
 
@@ -142,7 +182,4 @@ class TwilioWebhookPayload(BaseModel):
     def get_phone_number_without_prefix(self) -> str:
         """Extract sender's phone number without either whatsapp: or + prefix"""
         # Remove "whatsapp:" and "+" prefixes if present
-        phone_number = self.From.replace("whatsapp:", "")
-        if phone_number.startswith("+"):
-            return phone_number[1:]
-        return phone_number
+        return self.From.removeprefix("whatsapp:").removeprefix("+")
@@ -1,16 +1,22 @@
 """Customer lookup service for fetching customer metadata."""
 
+import asyncio
 import httpx
 import logging
 from typing import Optional
 
 from pydantic import ValidationError
 
+from ai_voice_shared.cache import TTLCache
 from ai_voice_shared.settings import CustomerLookupSettings
 from ai_voice_shared.models import CustomerMetadata
 
 logger = logging.getLogger(__name__)
 
+# Customer metadata rarely changes, so successful lookups are reused for a while
+CUSTOMER_CACHE_TTL_SECONDS = 300
+CUSTOMER_CACHE_MAX_SIZE = 10_000
+
 
 class CustomerLookupClient:
     """Service for looking up customer metadata by phone number via HTTP API."""
@@ -26,11 +32,34 @@ class CustomerLookupClient:
             settings = CustomerLookupSettings()
         self.api_base_url = settings.wunse_api_base_url.rstrip('/')
         self.api_key = settings.wunse_api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._customer_cache: TTLCache[str, CustomerMetadata] = TTLCache(CUSTOMER_CACHE_MAX_SIZE)
+        self._lookup_locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all lookups, so the connection to the API is kept alive between calls."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base_url,
+                headers={"x-api-key": self.api_key},
+                timeout=10.0,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def fetch_customer_metadata(self, phone_number: str) -> CustomerMetadata:
         """
         Fetch customer metadata by phone number via HTTP API.
 
+        Successful lookups are cached for CUSTOMER_CACHE_TTL_SECONDS, and
+        concurrent lookups for the same number share one API call.
+
         Args:
             phone_number: Phone number to lookup (with or without whatsapp: prefix)
 
@@ -41,51 +70,76 @@ class CustomerLookupClient:
             ValueError: If the API request fails or returns an error status
         """
         # Remove whatsapp: prefix if present
-        clean_phone_number = phone_number.replace("whatsapp:", "")
-
-        logger.info(f"Looking up customer metadata for phone number: {clean_phone_number}")
+        clean_phone_number = phone_number.removeprefix("whatsapp:")
+
+        cached = self._get_cached_customer(clean_phone_number)
+        if cached is not None:
+            return cached
+
+        lock = self._lookup_locks.setdefault(clean_phone_number, asyncio.Lock())
+        async with lock:
+            try:
+                # A concurrent lookup for this number may have finished while we waited
+                cached = self._get_cached_customer(clean_phone_number)
+                if cached is not None:
+                    return cached
+
+                metadata = await self._lookup_customer(clean_phone_number)
+                self._customer_cache.set(clean_phone_number, metadata, CUSTOMER_CACHE_TTL_SECONDS)
+                return metadata
+            finally:
+                # Only drop our own lock; a later lookup may have registered a new one
+                if self._lookup_locks.get(clean_phone_number) is lock:
+                    del self._lookup_locks[clean_phone_number]
+
+    def _get_cached_customer(self, clean_phone_number: str) -> Optional[CustomerMetadata]:
+        """Return cached metadata for a phone number if it has not expired."""
+        cached = self._customer_cache.get(clean_phone_number)
+        if cached is not None:
+            logger.debug("Using cached customer metadata for %s", clean_phone_number)
+        return cached
+
+    async def _lookup_customer(self, clean_phone_number: str) -> CustomerMetadata:
+        """Call the customer lookup API for a phone number without the whatsapp: prefix."""
+        logger.info("Looking up customer metadata for phone number: %s", clean_phone_number)
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_base_url}/customer-lookup/customers/lookup",
-                    params={"phone_number": clean_phone_number},
-                    headers={"x-api-key": self.api_key},
-                    timeout=10.0
-                )
-
-                # Handle different status codes
-                if response.status_code == 404:
-                    error_body = response.json()
-                    error_msg = error_body.get('error', f'Customer not found for phone number: {clean_phone_number}')
-                    logger.warning(f"Customer not found: {error_msg}")
-                    raise ValueError(error_msg)
-                elif response.status_code == 401:
-                    logger.error("Unauthorized: Invalid API key")
-                    raise ValueError("Customer lookup failed: Unauthorized")
-                elif response.status_code == 400:
-                    error_body = response.json()
-                    error_msg = error_body.get('error', 'Bad request')
-                    logger.error(f"Bad request: {error_msg}")
-                    raise ValueError(f"Customer lookup failed: {error_msg}")
-                elif response.status_code != 200:
-                    logger.error(f"API returned error status {response.status_code}")
-                    raise ValueError(f"Customer lookup failed: HTTP {response.status_code}")
-
-                # Parse and validate response
-                response.raise_for_status()
-                body = response.json()
-
-                logger.info(f"Successfully retrieved customer metadata for {clean_phone_number}")
-
-                # Validate response has required fields
-                return CustomerMetadata.model_validate(body)
+            response = await self.client.get(
+                "/customer-lookup/customers/lookup",
+                params={"phone_number": clean_phone_number},
+            )
+
+            # Handle different status codes
+            if response.status_code == 404:
+                error_body = response.json()
+                error_msg = error_body.get('error', f'Customer not found for phone number: {clean_phone_number}')
+                logger.warning("Customer not found: %s", error_msg)
+                raise ValueError(error_msg)
+            elif response.status_code == 401:
+                logger.error("Unauthorized: Invalid API key")
+                raise ValueError("Customer lookup failed: Unauthorized")
+            elif response.status_code == 400:
+                error_body = response.json()
+                error_msg = error_body.get('error', 'Bad request')
+                logger.error("Bad request: %s", error_msg)
+                raise ValueError(f"Customer lookup failed: {error_msg}")
+            elif response.status_code != 200:
+                logger.error("API returned error status %s", response.status_code)
+                raise ValueError(f"Customer lookup failed: HTTP {response.status_code}")
+
+            # Parse and validate response
+            response.raise_for_status()
+
+            logger.info("Successfully retrieved customer metadata for %s", clean_phone_number)
+
+            # Validate the raw JSON body directly, without building an intermediate dict
+            return CustomerMetadata.model_validate_json(response.content)
 
         except httpx.HTTPError as e:
-            logger.error(f"HTTP error during customer lookup: {e}")
+            logger.error("HTTP error during customer lookup: %s", e)
             raise ValueError(f"Customer lookup failed: {e}")
         except ValidationError:
             raise
         except Exception as e:
-            logger.error(f"Failed to fetch customer metadata: {e}")
+            logger.error("Failed to fetch customer metadata: %s", e)
             raise ValueError(f"Customer lookup failed: {e}")
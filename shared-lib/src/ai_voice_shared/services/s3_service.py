@@ -1,13 +1,15 @@
 """Unified S3 service for all AI Voice Tool microservices."""
 
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from ai_voice_shared.cache import TTLCache
 from ai_voice_shared.models import (
     S3ListResponse,
     S3ObjectMetadata,
@@ -20,6 +22,22 @@ from ai_voice_shared.settings import S3Settings
 
 logger = logging.getLogger(__name__)
 
+# Presigned URLs are reused until this many seconds before they expire
+PRESIGNED_URL_REUSE_MARGIN_SECONDS = 60
+PRESIGNED_URL_CACHE_MAX_SIZE = 1024
+
+# Chunk size for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Uploads of at least this size are sent as a multipart upload with parts in parallel
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_PART_SIZE = 5 * 1024 * 1024  # Smallest part size S3 accepts (except the last part)
+MULTIPART_MAX_CONCURRENCY = 4
+
+# Error codes S3 returns when a conditional write finds the key already exists
+# (ConditionalRequestConflict means another write to the key is in progress)
+_KEY_EXISTS_ERROR_CODES = ("PreconditionFailed", "ConditionalRequestConflict")
+
 
 class S3Service:
     """
@@ -29,12 +47,14 @@ class S3Service:
     and the data-api-server S3 service.
     """
 
-    def __init__(self, settings: S3Settings | None = None):
+    def __init__(self, settings: S3Settings | None = None, client_config: Config | None = None):
         """
         Initialize S3 service with settings.
 
         Args:
             settings: S3 settings. If None, will be loaded from environment.
+            client_config: Optional botocore Config (connection pool size, retries, ...)
+                merged over the default client configuration.
         """
         if settings is None:
             settings = S3Settings()
@@ -49,8 +69,13 @@ class S3Service:
 
         session = boto3.Session(**session_kwargs)
         config = Config(region_name=settings.aws_region)
+        if client_config is not None:
+            config = config.merge(client_config)
         self.s3_client = session.client("s3", config=config)
 
+        # (key, expiration) -> presigned URL, reused until shortly before it expires
+        self._presigned_url_cache: TTLCache[tuple[str, int], str] = TTLCache(PRESIGNED_URL_CACHE_MAX_SIZE)
+
     async def exists(self, key: str) -> bool:
         """
         Check if an object exists in S3.
@@ -62,7 +87,7 @@ class S3Service:
             True if object exists, False otherwise
         """
         try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            await asyncio.to_thread(self.s3_client.head_object, Bucket=self.bucket_name, Key=key)
             logger.debug(f"Object exists in S3: {key}")
             return True
         except ClientError as e:
@@ -95,25 +120,89 @@ class S3Service:
         Raises:
             FileExistsError: If file exists and overwrite is False
         """
-        # Check if file exists and handle overwrite
-        if await self.exists(key):
-            if not overwrite:
+        # Conditional write: S3 rejects the upload if the key already exists,
+        # so no separate HEAD request is needed
+        condition = {} if overwrite else {"IfNoneMatch": "*"}
+
+        try:
+            if len(data) >= MULTIPART_THRESHOLD:
+                await self._upload_multipart(data, key, content_type, condition)
+            else:
+                await asyncio.to_thread(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=data,
+                    ContentType=content_type,
+                    **condition,
+                )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in _KEY_EXISTS_ERROR_CODES:
                 logger.warning(f"File already exists and overwrite is False: {key}")
                 raise FileExistsError(
                     f"File already exists at {key}. Set overwrite=True to replace it."
-                )
-            logger.info(f"Overwriting existing file: {key}")
-        else:
-            logger.info(f"Uploading new file: {key}")
+                ) from e
+            raise
+        logger.info(f"Successfully uploaded file: {key}")
+        return key
+
+    async def _upload_multipart(
+        self,
+        data: bytes,
+        key: str,
+        content_type: str,
+        condition: dict[str, str],
+    ) -> None:
+        """
+        Upload data as a multipart upload, sending up to MULTIPART_MAX_CONCURRENCY parts at once.
 
-        self.s3_client.put_object(
+        The condition (e.g. IfNoneMatch) applies when the upload is completed. The
+        upload is aborted if any step fails, so no orphaned parts are left behind.
+        """
+        response = await asyncio.to_thread(
+            self.s3_client.create_multipart_upload,
             Bucket=self.bucket_name,
             Key=key,
-            Body=data,
             ContentType=content_type,
         )
-        logger.info(f"Successfully uploaded file: {key}")
-        return key
+        upload_id = response["UploadId"]
+        semaphore = asyncio.Semaphore(MULTIPART_MAX_CONCURRENCY)
+
+        async def _upload_part(part_number: int, start: int) -> dict[str, Any]:
+            async with semaphore:
+                part = await asyncio.to_thread(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=data[start:start + MULTIPART_PART_SIZE],
+                )
+            return {"PartNumber": part_number, "ETag": part["ETag"]}
+
+        try:
+            parts = await asyncio.gather(
+                *(
+                    _upload_part(part_number, start)
+                    for part_number, start in enumerate(range(0, len(data), MULTIPART_PART_SIZE), start=1)
+                )
+            )
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+                **condition,
+            )
+        except Exception:
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+            )
+            raise
 
     async def download(self, key: str) -> bytes:
         """
@@ -128,8 +217,33 @@ class S3Service:
         Raises:
             ClientError: If object doesn't exist or other S3 error occurs
         """
-        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
-        return response["Body"].read()
+        def _get_object() -> bytes:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return response["Body"].read()
+
+        return await asyncio.to_thread(_get_object)
+
+    async def download_stream(self, key: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Download an object from S3 in chunks, without holding the whole object in memory.
+
+        Args:
+            key: S3 object key
+            chunk_size: Maximum size of each chunk in bytes
+
+        Yields:
+            Object data in chunks of at most chunk_size bytes
+
+        Raises:
+            ClientError: If object doesn't exist or other S3 error occurs
+        """
+        response = await asyncio.to_thread(self.s3_client.get_object, Bucket=self.bucket_name, Key=key)
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
 
     async def delete(self, key: str) -> None:
         """
@@ -138,9 +252,13 @@ class S3Service:
         Args:
             key: S3 object key
         """
-        self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
+        await asyncio.to_thread(self.s3_client.delete_object, Bucket=self.bucket_name, Key=key)
         logger.info(f"Deleted object from S3: {key}")
 
+        # Cached presigned URLs for the key would now point at a missing object
+        for cache_key in [k for k in self._presigned_url_cache if k[0] == key]:
+            self._presigned_url_cache.pop(cache_key)
+
     async def list_objects(
         self,
         company_id: str,
@@ -175,7 +293,7 @@ class S3Service:
             if continuation_token:
                 params["ContinuationToken"] = continuation_token
 
-            response = self.s3_client.list_objects_v2(**params)
+            response = await asyncio.to_thread(self.s3_client.list_objects_v2, **params)
 
             files = []
             if "Contents" in response:
@@ -190,8 +308,10 @@ class S3Service:
                     else:
                         last_modified_str = str(last_modified)
 
+                    # Fields come straight from S3 with the declared types, so skip
+                    # per-object validation (up to 1000 objects per page)
                     files.append(
-                        S3ObjectMetadata(
+                        S3ObjectMetadata.model_construct(
                             key=obj["Key"],
                             etag=obj["ETag"],
                             size=obj["Size"],
@@ -218,6 +338,10 @@ class S3Service:
         """
         Generate a presigned URL for downloading an object.
 
+        URLs are cached per key and expiration and reused until
+        PRESIGNED_URL_REUSE_MARGIN_SECONDS before they expire, so repeated
+        requests for the same file skip the HEAD request and SigV4 signing.
+
         Args:
             key: S3 object key
             expiration: URL expiration time in seconds (default: 300 = 5 minutes)
@@ -228,6 +352,12 @@ class S3Service:
         Raises:
             ValueError: If object does not exist
         """
+        cache_key = (key, expiration)
+        cached = self._presigned_url_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Reusing cached presigned URL for: {key}")
+            return cached
+
         # First check if object exists
         if not await self.exists(key):
             raise ValueError(f"Object not found: {key}")
@@ -239,11 +369,15 @@ class S3Service:
                 ExpiresIn=expiration,
             )
             logger.info(f"Generated presigned URL for: {key}")
-            return url
         except ClientError as e:
             logger.error(f"Error generating presigned URL: {e}")
             raise
 
+        reuse_seconds = expiration - PRESIGNED_URL_REUSE_MARGIN_SECONDS
+        if reuse_seconds > 0:
+            self._presigned_url_cache.set(cache_key, url, reuse_seconds)
+        return url
+
     async def list_objects_ids_only(
         self,
         company_id: str,
@@ -356,7 +490,8 @@ class S3Service:
 
             try:
                 # List all files for this company/intent combination
-                response = self.s3_client.list_objects_v2(
+                response = await asyncio.to_thread(
+                    self.s3_client.list_objects_v2,
                     Bucket=self.bucket_name,
                     Prefix=prefix,
                     MaxKeys=1000,
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from ai_voice_shared.cache import TTLCache
+
+
+def test_get_returns_value_until_expiry():
+    cache = TTLCache(max_size=10)
+    with patch("ai_voice_shared.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        cache.set("key", "value", ttl_seconds=60)
+
+        mock_time.monotonic.return_value = 1059.0
+        assert cache.get("key") == "value"
+
+        mock_time.monotonic.return_value = 1060.0
+        assert cache.get("key") is None
+
+    assert cache.get("missing") is None
+
+
+def test_set_evicts_expired_entries_first_when_full():
+    cache = TTLCache(max_size=2)
+    with patch("ai_voice_shared.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        cache.set("oldest", 1, ttl_seconds=300)
+        cache.set("short-lived", 2, ttl_seconds=10)
+
+        mock_time.monotonic.return_value = 1100.0
+        cache.set("new", 3, ttl_seconds=300)
+
+    assert list(cache) == ["oldest", "new"]
+
+
+def test_set_evicts_oldest_entry_when_full_of_live_entries():
+    cache = TTLCache(max_size=2)
+    cache.set("first", 1, ttl_seconds=300)
+    cache.set("second", 2, ttl_seconds=300)
+
+    cache.set("third", 3, ttl_seconds=300)
+
+    assert list(cache) == ["second", "third"]
+    assert len(cache) == 2
+
+
+def test_pop_removes_key():
+    cache = TTLCache(max_size=10)
+    cache.set("key", "value", ttl_seconds=60)
+
+    cache.pop("key")
+    cache.pop("missing")
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
@@ -1,9 +1,11 @@
+import asyncio
+import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from pydantic import ValidationError
 import httpx
 
-from ai_voice_shared.services.customer_lookup_client import CustomerLookupClient
+from ai_voice_shared.services.customer_lookup_client import CUSTOMER_CACHE_TTL_SECONDS, CustomerLookupClient
 from ai_voice_shared.settings import CustomerLookupSettings
 
 @pytest.fixture
@@ -41,13 +43,11 @@ async def test_fetch_customer_metadata_success(mock_customer_lookup_settings):
     with patch("ai_voice_shared.services.customer_lookup_client.httpx.AsyncClient") as mock_async_client_class:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = expected_metadata
+        mock_response.content = json.dumps(expected_metadata).encode()
         mock_response.raise_for_status = MagicMock()
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         metadata = await client.fetch_customer_metadata("whatsapp:+1234567890")
@@ -56,12 +56,41 @@ async def test_fetch_customer_metadata_success(mock_customer_lookup_settings):
         assert metadata.company_id == "comp456"
         assert metadata.company_name == "TestCo"
 
-        mock_client.get.assert_called_once_with(
-            "https://api.example.com/customer-lookup/customers/lookup",
-            params={"phone_number": "+1234567890"},
+        mock_async_client_class.assert_called_once_with(
+            base_url="https://api.example.com",
             headers={"x-api-key": "test-api-key-123"},
             timeout=10.0
         )
+        mock_client.get.assert_called_once_with(
+            "/customer-lookup/customers/lookup",
+            params={"phone_number": "+1234567890"},
+        )
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_reuses_http_client(mock_customer_lookup_settings):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+
+    with patch("ai_voice_shared.services.customer_lookup_client.httpx.AsyncClient") as mock_async_client_class:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({
+            "customer_id": "cust123",
+            "company_id": "comp456",
+            "company_name": "TestCo"
+        }).encode()
+
+        mock_client = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_client.aclose = AsyncMock()
+        mock_async_client_class.return_value = mock_client
+
+        await client.fetch_customer_metadata("+1234567890")
+        await client.fetch_customer_metadata("+1987654321")
+        await client.aclose()
+
+        mock_async_client_class.assert_called_once()
+        assert mock_client.get.await_count == 2
+        mock_client.aclose.assert_awaited_once()
 
 @pytest.mark.asyncio
 async def test_fetch_customer_metadata_not_found(mock_customer_lookup_settings):
@@ -74,8 +103,6 @@ async def test_fetch_customer_metadata_not_found(mock_customer_lookup_settings):
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValueError, match="Customer not found for phone: 1234567890"):
@@ -92,8 +119,6 @@ async def test_fetch_customer_metadata_server_error(mock_customer_lookup_setting
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValueError, match="Customer lookup failed: HTTP 500"):
@@ -110,8 +135,6 @@ async def test_fetch_customer_metadata_unauthorized(mock_customer_lookup_setting
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValueError, match="Customer lookup failed: Unauthorized"):
@@ -128,8 +151,6 @@ async def test_fetch_customer_metadata_bad_request(mock_customer_lookup_settings
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValueError, match="Customer lookup failed: Missing phone_number parameter"):
@@ -142,13 +163,11 @@ async def test_fetch_customer_metadata_invalid_response_body(mock_customer_looku
     with patch("ai_voice_shared.services.customer_lookup_client.httpx.AsyncClient") as mock_async_client_class:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"not_a_customer_metadata_field": "value"}  # Invalid structure
+        mock_response.content = json.dumps({"not_a_customer_metadata_field": "value"}).encode()  # Invalid structure
         mock_response.raise_for_status = MagicMock()
 
         mock_client = MagicMock()
         mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValidationError):
@@ -161,9 +180,118 @@ async def test_fetch_customer_metadata_http_exception(mock_customer_lookup_setti
     with patch("ai_voice_shared.services.customer_lookup_client.httpx.AsyncClient") as mock_async_client_class:
         mock_client = MagicMock()
         mock_client.get = AsyncMock(side_effect=httpx.RequestError("Network error", request=None))
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
         mock_async_client_class.return_value = mock_client
 
         with pytest.raises(ValueError, match="Customer lookup failed:"):
             await client.fetch_customer_metadata("1234567890")
+
+@pytest.fixture
+def mock_lookup_http_client():
+    """Fixture to patch the HTTP client with one returning valid customer metadata."""
+    with patch("ai_voice_shared.services.customer_lookup_client.httpx.AsyncClient") as mock_async_client_class:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({
+            "customer_id": "cust123",
+            "company_id": "comp456",
+            "company_name": "TestCo"
+        }).encode()
+
+        mock_client = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_async_client_class.return_value = mock_client
+        yield mock_client
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_cached(mock_customer_lookup_settings, mock_lookup_http_client):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+
+    first = await client.fetch_customer_metadata("whatsapp:+1234567890")
+    second = await client.fetch_customer_metadata("+1234567890")
+
+    assert second == first
+    mock_lookup_http_client.get.assert_awaited_once() # Same number with or without prefix hits the cache
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_cache_expires(mock_customer_lookup_settings, mock_lookup_http_client):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+
+    # Patch the cache module's own time reference so asyncio's clock is left alone
+    with patch("ai_voice_shared.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        await client.fetch_customer_metadata("+1234567890")
+
+    # TTL expired: looked up again
+    with patch("ai_voice_shared.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0 + CUSTOMER_CACHE_TTL_SECONDS
+        await client.fetch_customer_metadata("+1234567890")
+
+    assert mock_lookup_http_client.get.await_count == 2
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_concurrent_lookups_coalesced(mock_customer_lookup_settings, mock_lookup_http_client):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+    response = mock_lookup_http_client.get.return_value
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0) # Yield so the other lookups start while this one is in flight
+        return response
+
+    mock_lookup_http_client.get.side_effect = slow_get
+
+    results = await asyncio.gather(*(client.fetch_customer_metadata("+1234567890") for _ in range(5)))
+
+    assert all(result.customer_id == "cust123" for result in results)
+    mock_lookup_http_client.get.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_failures_not_cached(mock_customer_lookup_settings, mock_lookup_http_client):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+    mock_lookup_http_client.get.return_value.status_code = 404
+    mock_lookup_http_client.get.return_value.json.return_value = {"error": "Customer not found"}
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Customer not found"):
+            await client.fetch_customer_metadata("+1234567890")
+
+    assert mock_lookup_http_client.get.await_count == 2
+
+@pytest.mark.asyncio
+async def test_fetch_customer_metadata_failed_lookup_keeps_newer_lock(mock_customer_lookup_settings, mock_lookup_http_client):
+    client = CustomerLookupClient(settings=mock_customer_lookup_settings)
+    response = mock_lookup_http_client.get.return_value
+    responses = [asyncio.get_running_loop().create_future() for _ in range(3)]
+    pending = iter(responses)
+
+    async def controlled_get(*args, **kwargs):
+        return await next(pending) # Each call waits until the test resolves its response
+
+    mock_lookup_http_client.get.side_effect = controlled_get
+
+    async def settle():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    # First lookup fails while a second one waits on the same lock
+    first = asyncio.create_task(client.fetch_customer_metadata("+1234567890"))
+    await settle()
+    second = asyncio.create_task(client.fetch_customer_metadata("+1234567890"))
+    await settle()
+    responses[0].set_exception(httpx.ConnectError("down"))
+    await settle()
+
+    # A third lookup registers a new lock while the second is still in flight
+    third = asyncio.create_task(client.fetch_customer_metadata("+1234567890"))
+    await settle()
+    responses[1].set_exception(httpx.ConnectError("down"))
+    await settle()
+
+    # The failed second lookup must not remove the third lookup's lock
+    assert "+1234567890" in client._lookup_locks
+
+    responses[2].set_result(response)
+    assert (await third).customer_id == "cust123"
+    for task in (first, second):
+        with pytest.raises(ValueError, match="Customer lookup failed"):
+            await task
+    assert client._lookup_locks == {}
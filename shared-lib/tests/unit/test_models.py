@@ -1,4 +1,5 @@
 import pytest
+from pydantic import ValidationError
 from ai_voice_shared.models import TwilioWebhookPayload, CustomerMetadata, S3ObjectMetadata, S3ListResponse
 
 @pytest.fixture
@@ -100,7 +101,7 @@ def test_twilio_webhook_payload_text_message(sample_text_webhook_payload):
     assert payload.MessageSid == "SMxxxxxxxxxxxxxxxxxxxxxxxxxxxxx1"
     assert payload.From == "whatsapp:+1234567890"
     assert payload.Body == "Hello, world!"
-    assert payload.NumMedia == "0"
+    assert payload.NumMedia == 0
     assert payload.get_message_type() == "text"
     assert payload.get_media_url() is None
     assert payload.get_phone_number() == "whatsapp:+1234567890"
@@ -111,7 +112,7 @@ def test_twilio_webhook_payload_audio_message(sample_audio_webhook_payload):
     assert payload.MessageSid == "SMxxxxxxxxxxxxxxxxxxxxxxxxxxxxx2"
     assert payload.From == "whatsapp:+1234567891"
     assert payload.Body is None
-    assert payload.NumMedia == "1"
+    assert payload.NumMedia == 1
     assert payload.MediaContentType0 == "audio/ogg"
     assert payload.get_message_type() == "audio"
     assert payload.get_media_url() == "https://api.twilio.com/2010-04-01/Accounts/ACxxxxxxxxxxxxxxxxxxxxxxxxxxxxx2/Messages/SMxxxxxxxxxxxxxxxxxxxxxxxxxxxxx2/Media/MExxxxxxxxxxxxxxxxxxxxxxxxxxxxx2"
@@ -181,3 +182,42 @@ def test_s3_list_response_model():
 
     s3_list_no_token = S3ListResponse(files=[obj_meta1])
     assert s3_list_no_token.nextContinuationToken is None
+
+def test_twilio_webhook_payload_media_fields_parsed_once(sample_audio_webhook_payload):
+    payload_data = {**sample_audio_webhook_payload, "MessageType": None, "MediaContentType0": "AUDIO/OGG"}
+    payload = TwilioWebhookPayload(**payload_data)
+    assert payload.NumMedia == 1
+    assert payload._media_content_type0 == "audio/ogg"
+    assert payload.get_message_type() == "audio"
+    # Private attributes are not part of the serialized payload
+    assert "_media_content_type0" not in payload.model_dump()
+
+def test_twilio_webhook_payload_blank_counts(sample_text_webhook_payload):
+    payload = TwilioWebhookPayload(
+        **{**sample_text_webhook_payload, "NumMedia": "", "NumSegments": "", "ReferralNumMedia": ""}
+    )
+    assert payload.NumMedia == 0
+    assert payload.NumSegments == ""
+    assert payload.ReferralNumMedia == ""
+    assert payload.get_message_type() == "text"
+
+def test_twilio_webhook_payload_is_frozen(sample_text_webhook_payload):
+    payload = TwilioWebhookPayload(**sample_text_webhook_payload)
+    with pytest.raises(ValidationError):
+        payload.Body = "changed"
+    # Frozen models hash by value
+    assert hash(payload) == hash(TwilioWebhookPayload(**sample_text_webhook_payload))
+
+@pytest.mark.parametrize(
+    ("content_type", "expected_type"),
+    [
+        ("video/mp4", "video"),
+        ("image/jpeg", "image"),
+        ("application/pdf", "document"),
+        ("audio", "document"),  # No subtype, not a recognised media type
+    ],
+)
+def test_twilio_webhook_payload_message_type_from_content_type(sample_audio_webhook_payload, content_type, expected_type):
+    payload_data = {**sample_audio_webhook_payload, "MessageType": None, "MediaContentType0": content_type}
+    payload = TwilioWebhookPayload(**payload_data)
+    assert payload.get_message_type() == expected_type
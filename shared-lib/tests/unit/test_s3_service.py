@@ -1,9 +1,12 @@
+import asyncio
+import threading
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, ANY
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from datetime import datetime, timezone
 
-from ai_voice_shared.services.s3_service import S3Service
+from ai_voice_shared.services.s3_service import PRESIGNED_URL_REUSE_MARGIN_SECONDS, S3Service
 from ai_voice_shared.settings import S3Settings
 from ai_voice_shared.models import S3ListResponse
 
@@ -40,6 +43,18 @@ async def test_s3_service_init_without_settings(mock_boto3_session, monkeypatch)
     mock_session.assert_called_once_with(region_name="us-west-2")
     mock_session.return_value.client.assert_called_once_with("s3", config=ANY)
 
+@pytest.mark.asyncio
+async def test_s3_service_init_with_client_config(mock_boto3_session, mock_s3_settings):
+    mock_session, mock_client = mock_boto3_session
+    S3Service(settings=mock_s3_settings, client_config=Config(max_pool_connections=50))
+    config = mock_session.return_value.client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 50
+    assert config.region_name == "us-east-1"
+
+def test_s3_service_client_config_reaches_boto3_client(mock_s3_settings):
+    service = S3Service(settings=mock_s3_settings, client_config=Config(tcp_keepalive=True))
+    assert service.s3_client.meta.config.tcp_keepalive is True
+
 @pytest.mark.asyncio
 async def test_exists_object_found(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
@@ -69,7 +84,6 @@ async def test_exists_other_client_error(mock_boto3_session, mock_s3_settings):
 async def test_upload_new_file(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
     service = S3Service(settings=mock_s3_settings)
-    service.exists = AsyncMock(return_value=False) # Mock exists to return False
     
     key = "new-file.txt"
     data = b"hello world"
@@ -78,19 +92,21 @@ async def test_upload_new_file(mock_boto3_session, mock_s3_settings):
     uploaded_key = await service.upload(data, key, content_type)
     
     assert uploaded_key == key
-    service.exists.assert_called_once_with(key)
+    mock_client.head_object.assert_not_called() # Conditional PUT replaces the existence check
     mock_client.put_object.assert_called_once_with(
         Bucket="test-bucket",
         Key=key,
         Body=data,
         ContentType=content_type,
+        IfNoneMatch="*",
     )
 
 @pytest.mark.asyncio
-async def test_upload_file_exists_no_overwrite(mock_boto3_session, mock_s3_settings):
+@pytest.mark.parametrize("error_code", ["PreconditionFailed", "ConditionalRequestConflict"])
+async def test_upload_file_exists_no_overwrite(mock_boto3_session, mock_s3_settings, error_code):
     _, mock_client = mock_boto3_session
     service = S3Service(settings=mock_s3_settings)
-    service.exists = AsyncMock(return_value=True) # Mock exists to return True
+    mock_client.put_object.side_effect = ClientError({"Error": {"Code": error_code}}, "PutObject")
     
     key = "existing-file.txt"
     data = b"hello world"
@@ -99,14 +115,21 @@ async def test_upload_file_exists_no_overwrite(mock_boto3_session, mock_s3_setti
     with pytest.raises(FileExistsError):
         await service.upload(data, key, content_type, overwrite=False)
     
-    service.exists.assert_called_once_with(key)
-    mock_client.put_object.assert_not_called()
+    mock_client.head_object.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upload_other_client_error(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    mock_client.put_object.side_effect = ClientError({"Error": {"Code": "AccessDenied"}}, "PutObject")
+    
+    with pytest.raises(ClientError):
+        await service.upload(b"hello world", "new-file.txt", "text/plain")
 
 @pytest.mark.asyncio
 async def test_upload_file_exists_with_overwrite(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
     service = S3Service(settings=mock_s3_settings)
-    service.exists = AsyncMock(return_value=True) # Mock exists to return True
     
     key = "existing-file.txt"
     data = b"hello world"
@@ -115,7 +138,7 @@ async def test_upload_file_exists_with_overwrite(mock_boto3_session, mock_s3_set
     uploaded_key = await service.upload(data, key, content_type, overwrite=True)
     
     assert uploaded_key == key
-    service.exists.assert_called_once_with(key)
+    mock_client.head_object.assert_not_called()
     mock_client.put_object.assert_called_once_with(
         Bucket="test-bucket",
         Key=key,
@@ -123,6 +146,53 @@ async def test_upload_file_exists_with_overwrite(mock_boto3_session, mock_s3_set
         ContentType=content_type,
     )
 
+@pytest.fixture
+def small_multipart_parts(monkeypatch):
+    """Shrink the multipart threshold and part size so tests can use small payloads."""
+    monkeypatch.setattr("ai_voice_shared.services.s3_service.MULTIPART_THRESHOLD", 8)
+    monkeypatch.setattr("ai_voice_shared.services.s3_service.MULTIPART_PART_SIZE", 4)
+
+@pytest.mark.asyncio
+async def test_upload_large_file_uses_multipart(mock_boto3_session, mock_s3_settings, small_multipart_parts):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    mock_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    mock_client.upload_part.side_effect = lambda **kwargs: {"ETag": f'"etag-{kwargs["PartNumber"]}"'}
+
+    await service.upload(b"0123456789", "large.ogg", "audio/ogg", overwrite=False)
+
+    mock_client.put_object.assert_not_called()
+    mock_client.create_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket", Key="large.ogg", ContentType="audio/ogg"
+    )
+    bodies = {call.kwargs["PartNumber"]: call.kwargs["Body"] for call in mock_client.upload_part.call_args_list}
+    assert bodies == {1: b"0123", 2: b"4567", 3: b"89"}
+    mock_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket",
+        Key="large.ogg",
+        UploadId="upload-1",
+        MultipartUpload={"Parts": [{"PartNumber": n, "ETag": f'"etag-{n}"'} for n in (1, 2, 3)]},
+        IfNoneMatch="*",
+    )
+    mock_client.abort_multipart_upload.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upload_multipart_existing_key_aborts(mock_boto3_session, mock_s3_settings, small_multipart_parts):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    mock_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    mock_client.upload_part.return_value = {"ETag": '"etag"'}
+    mock_client.complete_multipart_upload.side_effect = ClientError(
+        {"Error": {"Code": "PreconditionFailed"}}, "CompleteMultipartUpload"
+    )
+
+    with pytest.raises(FileExistsError):
+        await service.upload(b"0123456789", "large.ogg", "audio/ogg", overwrite=False)
+
+    mock_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="test-bucket", Key="large.ogg", UploadId="upload-1"
+    )
+
 @pytest.mark.asyncio
 async def test_download_success(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
@@ -134,6 +204,21 @@ async def test_download_success(mock_boto3_session, mock_s3_settings):
     assert data == b"downloaded data"
     mock_client.get_object.assert_called_once_with(Bucket="test-bucket", Key="download-key")
 
+@pytest.mark.asyncio
+async def test_download_stream_yields_chunks(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    body = MagicMock()
+    body.read.side_effect = [b"down", b"load", b""]
+    mock_client.get_object.return_value = {"Body": body}
+
+    chunks = [chunk async for chunk in service.download_stream("download-key", chunk_size=4)]
+
+    assert chunks == [b"down", b"load"]
+    body.read.assert_called_with(4)
+    body.close.assert_called_once()
+    mock_client.get_object.assert_called_once_with(Bucket="test-bucket", Key="download-key")
+
 @pytest.mark.asyncio
 async def test_delete_success(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
@@ -216,6 +301,26 @@ async def test_list_objects_no_contents(mock_boto3_session, mock_s3_settings):
     assert len(response.files) == 0
     assert response.nextContinuationToken is None
 
+@pytest.mark.asyncio
+async def test_list_objects_concurrent_calls_overlap(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    # Both calls must be inside list_objects_v2 at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def list_objects_v2(**kwargs):
+        barrier.wait()
+        return {"IsTruncated": False}
+
+    mock_client.list_objects_v2.side_effect = list_objects_v2
+
+    responses = await asyncio.gather(
+        service.list_objects("company1", "intent1"),
+        service.list_objects("company2", "intent1"),
+    )
+
+    assert [len(response.files) for response in responses] == [0, 0]
+
 @pytest.mark.asyncio
 async def test_list_objects_client_error(mock_boto3_session, mock_s3_settings):
     _, mock_client = mock_boto3_session
@@ -262,4 +367,57 @@ async def test_generate_presigned_url_client_error(mock_boto3_session, mock_s3_s
     with pytest.raises(ClientError):
         await service.generate_presigned_url("error-key")
     
-    service.exists.assert_called_once_with("error-key")
\ No newline at end of file
+    service.exists.assert_called_once_with("error-key")
+
+
+@pytest.mark.asyncio
+async def test_generate_presigned_url_reuses_cached_url(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    service.exists = AsyncMock(return_value=True)
+    mock_client.generate_presigned_url.return_value = "http://presigned.url/test-key"
+
+    first = await service.generate_presigned_url("test-key")
+    second = await service.generate_presigned_url("test-key")
+
+    assert first == second == "http://presigned.url/test-key"
+    service.exists.assert_called_once_with("test-key")
+    mock_client.generate_presigned_url.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_delete_drops_cached_presigned_urls(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    service.exists = AsyncMock(return_value=True)
+    mock_client.generate_presigned_url.return_value = "http://presigned.url/test-key"
+    await service.generate_presigned_url("test-key", expiration=300)
+    await service.generate_presigned_url("test-key", expiration=600)
+    await service.generate_presigned_url("other-key")
+
+    await service.delete("test-key")
+
+    # The deleted key is checked again and reported missing
+    service.exists.return_value = False
+    with pytest.raises(ValueError, match="Object not found: test-key"):
+        await service.generate_presigned_url("test-key")
+    assert list(service._presigned_url_cache) == [("other-key", 300)]
+
+@pytest.mark.asyncio
+async def test_generate_presigned_url_regenerated_near_expiry(mock_boto3_session, mock_s3_settings):
+    _, mock_client = mock_boto3_session
+    service = S3Service(settings=mock_s3_settings)
+    service.exists = AsyncMock(return_value=True)
+    mock_client.generate_presigned_url.side_effect = ["http://presigned.url/1", "http://presigned.url/2"]
+
+    # Patch the cache module's own time reference so asyncio's clock is left alone
+    with patch("ai_voice_shared.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        first = await service.generate_presigned_url("test-key", expiration=300)
+
+        # Within the reuse margin before the URL expires: generated again
+        mock_time.monotonic.return_value = 1000.0 + 300 - PRESIGNED_URL_REUSE_MARGIN_SECONDS
+        second = await service.generate_presigned_url("test-key", expiration=300)
+
+    assert first == "http://presigned.url/1"
+    assert second == "http://presigned.url/2"
+    assert mock_client.generate_presigned_url.call_count == 2
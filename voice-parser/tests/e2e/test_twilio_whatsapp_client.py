@@ -1,4 +1,5 @@
 import pytest
+import pytest_asyncio
 import os
 from dotenv import load_dotenv
 from voice_parser.services.twilio_whatsapp_client import TwilioWhatsAppClient
@@ -11,7 +12,7 @@ def load_test_env():
     load_dotenv(".env.test")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_twilio_settings():
     """Create Twilio settings using test environment variables"""
     return TwilioWhatsAppSettings(
@@ -21,9 +22,9 @@ def test_twilio_settings():
     )
 
 
-@pytest.fixture
-def twilio_client(test_twilio_settings):
-    """Create Twilio client with test settings"""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def twilio_client(test_twilio_settings):
+    """Create one Twilio client with test settings, shared so its connection is reused across tests"""
     # Skip tests if essential settings are missing
     if not all([
         test_twilio_settings.twilio_account_sid,
@@ -31,13 +32,15 @@ def twilio_client(test_twilio_settings):
         test_twilio_settings.twilio_whatsapp_number
     ]):
         pytest.skip("Twilio credentials not fully configured in .env.test")
-    return TwilioWhatsAppClient(settings=test_twilio_settings)
+    client = TwilioWhatsAppClient(settings=test_twilio_settings)
+    yield client
+    await client.aclose()
 
 
 class TestTwilioWhatsAppClientIntegration:
     """Integration tests for Twilio WhatsApp client using real API"""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_send_message(self, twilio_client):
         """Test sending a real WhatsApp message"""
         recipient_phone = os.getenv("TWILIO_RECIPIENT_PHONE")
@@ -57,7 +60,7 @@ class TestTwilioWhatsAppClientIntegration:
         assert response["error_code"] is None
         assert response["to"] == f"whatsapp:{recipient_phone}"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_send_templated_message(self, twilio_client):
         """Test sending a real templated WhatsApp message"""
         recipient_phone = os.getenv("TWILIO_RECIPIENT_PHONE")
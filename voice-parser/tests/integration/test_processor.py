@@ -5,6 +5,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from unittest.mock import AsyncMock, patch, MagicMock
 from ai_voice_shared import TwilioWebhookPayload
+from voice_parser.core import processor
 from voice_parser.core.processor import process_message
 from ai_voice_shared.services.s3_service import S3Service
 from voice_parser.services.llm.models import JobsToBeDoneDocumentModel, MessageMetadata, MessageIntent, KnowledgeDocumentModel
@@ -18,6 +19,23 @@ def load_test_env():
     load_dotenv(".env.test")
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Drop the processor's cached service clients so each test's patched classes are used."""
+    factories = (
+        processor._get_whatsapp_client,
+        processor._get_customer_lookup_client,
+        processor._get_s3_service,
+        processor._get_llm_client,
+        processor._get_transcription_client,
+    )
+    for factory in factories:
+        factory.cache_clear()
+    yield
+    for factory in factories:
+        factory.cache_clear()
+
+
 @pytest.fixture
 def test_s3_settings():
     """Create S3 settings using test environment variables"""
@@ -1,6 +1,8 @@
 
+import asyncio
 import pytest
 import json
+from urllib.parse import urlencode
 from unittest.mock import patch
 from voice_parser import handler as handler_module
 
@@ -84,3 +86,58 @@ def test_handler_partial_batch_failure(mock_process_message):
     # Verify process_message was called for all three records
     assert mock_process_message.call_count == 3
 
+
+
+@pytest.mark.unit
+def test_handler_reuses_event_loop_across_invocations(mock_process_message):
+    """
+    Test that warm invocations run on the same event loop, so cached async clients stay usable.
+    """
+    loops = []
+
+    async def record_loop(payload):
+        loops.append(asyncio.get_running_loop())
+        return {"status": "success"}
+
+    mock_process_message.side_effect = record_loop
+
+    handler_module.lambda_handler(create_sqs_event([{"MessageSid": "sid-1", "From": "111"}]), {})
+    handler_module.lambda_handler(create_sqs_event([{"MessageSid": "sid-2", "From": "222"}]), {})
+
+    assert len(loops) == 2
+    assert loops[0] is loops[1]
+
+
+@pytest.mark.unit
+def test_handler_parses_form_encoded_body(mock_process_message):
+    """
+    Test that records carrying the raw Twilio form body are parsed from form encoding.
+    """
+    mock_process_message.return_value = {"status": "success"}
+    sqs_event = create_sqs_event([])
+    sqs_event["Records"].append(
+        {
+            "messageId": "msg-id-form",
+            "body": urlencode(
+                {
+                    "AccountSid": "ACxxxxxxxxxxxxxxxxxxxxxxxxxxxxx",
+                    "To": "whatsapp:+1234567890",
+                    "From": "whatsapp:+1111111111",
+                    "MessageSid": "sid-form-1",
+                    "Body": "",
+                    "NumMedia": "0",
+                }
+            ),
+            "messageAttributes": {
+                "ContentType": {"stringValue": "application/x-www-form-urlencoded", "dataType": "String"}
+            },
+        }
+    )
+
+    result = handler_module.lambda_handler(sqs_event, {})
+
+    assert result == {"batchItemFailures": []}
+    payload = mock_process_message.call_args.args[0]
+    assert payload.MessageSid == "sid-form-1"
+    assert payload.Body == ""
+    assert payload.get_message_type() == "text"
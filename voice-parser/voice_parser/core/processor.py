@@ -9,7 +9,9 @@ This module contains the business logic for processing WhatsApp voice messages:
 5. Structures the transcription using LLM
 """
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Any, Dict
 
 from ai_voice_shared import TwilioWebhookPayload
@@ -23,6 +25,35 @@ from ai_voice_shared import CustomerLookupClient
 logger = logging.getLogger(__name__)
 
 
+# Service clients are created on first use and reused across messages and warm
+# invocations, so their HTTP connection pools (and the boto3 S3 client) stay warm.
+# The Lambda handler runs every invocation on the same event loop, which the
+# async HTTP clients are bound to.
+@lru_cache(maxsize=1)
+def _get_whatsapp_client() -> TwilioWhatsAppClient:
+    return TwilioWhatsAppClient()
+
+
+@lru_cache(maxsize=1)
+def _get_customer_lookup_client() -> CustomerLookupClient:
+    return CustomerLookupClient()
+
+
+@lru_cache(maxsize=1)
+def _get_s3_service() -> S3Service:
+    return S3Service()
+
+
+@lru_cache(maxsize=1)
+def _get_llm_client() -> LLMClient:
+    return LLMClient()
+
+
+@lru_cache(maxsize=1)
+def _get_transcription_client() -> TranscriptionClient:
+    return TranscriptionClient()
+
+
 async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
     """
     Process a single WhatsApp message.
@@ -37,7 +68,7 @@ async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
         Exception: If processing fails
     """
     # Initialize Twilio WhatsApp client first (needed for sending responses)
-    whatsapp_client = TwilioWhatsAppClient()
+    whatsapp_client = _get_whatsapp_client()
 
     # Get message's phone number
     message_phonenumber = payload.get_phone_number()
@@ -45,7 +76,7 @@ async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
         raise ValueError("Could not extract sender phone number")
     
 
-    customer_lookup_client = CustomerLookupClient()
+    customer_lookup_client = _get_customer_lookup_client()
     customer_metadata = await customer_lookup_client.fetch_customer_metadata(message_phonenumber)
     company_id = customer_metadata.company_id
 
@@ -61,8 +92,8 @@ async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
     logger.info(f"Sent confirmation message, Twilio SID: {confirmation_response.get('sid')}, Status: {confirmation_response.get('status')}")
 
     # Initialize other service clients
-    s3_service = S3Service()
-    llm_client = LLMClient()
+    s3_service = _get_s3_service()
+    llm_client = _get_llm_client()
 
     if message_type == "text":
         full_text = payload.Body
@@ -75,7 +106,7 @@ async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
 
         logger.info(f"Processing audio message: {message_id}")
 
-        transcription_client = TranscriptionClient()
+        transcription_client = _get_transcription_client()
 
         # Download audio from Twilio
         logger.info(f"Downloading audio from Twilio: {message_id}")
@@ -108,52 +139,51 @@ async def process_message(payload: TwilioWebhookPayload) -> Dict[str, Any]:
     # Upload artifacts to S3
     key_prefix = f"{company_id}/{message_metadata.intent.value}/{message_metadata.tag}_{message_id}"
 
-    s3_keys = {}
+    # Upload the audio and full text concurrently
+    uploads = {}
     if message_type == "audio":
-        # Upload to S3 for persistence
-        s3_audio_key = await s3_service.upload(
+        uploads["audio"] = s3_service.upload(
             data=audio_data,
             key=f"{key_prefix}_audio.ogg",
             content_type="audio/ogg",
             overwrite=False,
         )
-        s3_keys["audio"] = s3_audio_key
-        logger.info(f"Uploaded audio to S3: {s3_audio_key}")
-
-    # Upload analysed text
-    s3_full_text_key = await s3_service.upload(
+    uploads["full_text"] = s3_service.upload(
         data=full_text.encode("utf-8"),
         key=f"{key_prefix}_full_text.txt",
         content_type="text/plain",
         overwrite=False,
     )
-    s3_keys["full_text"] = s3_full_text_key
-    logger.info(f"Uploaded text to analyze to S3: {s3_full_text_key}")
+    s3_keys = dict(zip(uploads, await asyncio.gather(*uploads.values())))
+    logger.info(f"Uploaded artifacts to S3: {s3_keys}")
 
     # Format structured analysis for WhatsApp message
     if structured_analysis:
         formatted_text = structured_analysis.format()
 
-        # Save to database
-        s3_text_summary_key = await s3_service.upload(
-            data=formatted_text.encode("utf-8"),
-            key=f"{key_prefix}.text_summary.txt",
-            content_type="text/plain",
-            overwrite=False,
-        )
-        s3_keys["text_summary"] = s3_text_summary_key
-
         # Send structured analysis back to user (with truncation if needed for WhatsApp limit)
         logger.info(f"Sending structured analysis to {message_phonenumber}")
         message_body = structured_analysis.format_for_whatsapp(
             tag=message_metadata.tag,
             prefix="Successfully ingested the following items:\n\n",
-            suffix="\n\nNote: Replies to this message are treated as new requests.\n"
+            suffix="\n\nNote: Replies to this message are treated as new requests.\n",
+            formatted=formatted_text,
         )
-        analysis_response = await whatsapp_client.send_message(
-            recipient_phone=message_phonenumber,
-            body=message_body
+
+        # Save the summary to S3 while the reply is sent
+        s3_text_summary_key, analysis_response = await asyncio.gather(
+            s3_service.upload(
+                data=formatted_text.encode("utf-8"),
+                key=f"{key_prefix}.text_summary.txt",
+                content_type="text/plain",
+                overwrite=False,
+            ),
+            whatsapp_client.send_message(
+                recipient_phone=message_phonenumber,
+                body=message_body
+            ),
         )
+        s3_keys["text_summary"] = s3_text_summary_key
         logger.info(f"Sent analysis message, Twilio SID: {analysis_response.get('sid')}, Status: {analysis_response.get('status')}")
     else:
         # For OTHER intent messages, send a simple confirmation
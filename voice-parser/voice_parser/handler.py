@@ -2,6 +2,7 @@ import asyncio
 import json
 import logging
 from typing import List, Dict, Any
+from urllib.parse import parse_qsl
 from ai_voice_shared.models import TwilioWebhookPayload
 from .core.processor import process_message
 
@@ -9,6 +10,24 @@ from .core.processor import process_message
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Content type the webhook handler sets when it forwards the raw Twilio form body
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# Event loop reused across warm invocations. The service clients in the processor
+# are cached between invocations and their async HTTP connection pools are bound
+# to the loop they were first used on, so asyncio.run (a new loop per call) would
+# break them.
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the module-level event loop, creating it on first use."""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
 
 def lambda_handler(event: Dict[str, Any], context: object) -> Dict[str, Any]:
     """
@@ -20,8 +39,8 @@ def lambda_handler(event: Dict[str, Any], context: object) -> Dict[str, Any]:
     """
     logger.info(f"Received SQS event with {len(event.get('Records', []))} records")
 
-    # Use asyncio.run to manage the async loop
-    results = asyncio.run(process_sqs_records(event.get("Records", [])))
+    # Run on the persistent loop so cached clients keep their connections
+    results = _get_event_loop().run_until_complete(process_sqs_records(event.get("Records", [])))
 
     # Filter out failed items
     failed_items = [result for result in results if result["status"] == "failed"]
@@ -51,6 +70,20 @@ async def process_sqs_records(records: List[Dict[str, Any]]) -> List[Dict[str, A
     return results
 
 
+def _parse_webhook_payload(record: Dict[str, Any]) -> TwilioWebhookPayload:
+    """
+    Parse the Twilio payload from an SQS record.
+
+    The webhook handler forwards Twilio's form-encoded body and marks it with a
+    ContentType attribute; records without it carry the payload as JSON.
+    """
+    content_type = record.get("messageAttributes", {}).get("ContentType", {}).get("stringValue")
+    if content_type == FORM_CONTENT_TYPE:
+        # keep_blank_values keeps empty fields such as Body= for media messages
+        return TwilioWebhookPayload(**dict(parse_qsl(record.get("body", ""), keep_blank_values=True)))
+    return TwilioWebhookPayload(**json.loads(record.get("body", "{}")))
+
+
 async def process_single_record(record: Dict[str, Any]) -> Dict[str, Any]:
     """
     Processes a single SQS record.
@@ -60,8 +93,7 @@ async def process_single_record(record: Dict[str, Any]) -> Dict[str, Any]:
     """
     message_id = record.get("messageId")
     try:
-        payload_body = json.loads(record.get("body", "{}"))
-        webhook_payload = TwilioWebhookPayload(**payload_body)
+        webhook_payload = _parse_webhook_payload(record)
 
         logger.info(f"Processing message: {webhook_payload.MessageSid}")
         result = await process_message(webhook_payload)
@@ -81,14 +81,17 @@ class StructuredDocumentModel(abc.ABC, BaseModel):
         """Get system message for how to structure document"""
         pass
 
-    def format_for_whatsapp(self, tag: str, prefix: str = "", suffix: str = "") -> str:
+    def format_for_whatsapp(self, tag: str, prefix: str = "", suffix: str = "", formatted: str | None = None) -> str:
         """Get WhatsApp-safe message, truncating if necessary.
 
         Returns formatted message that fits within WhatsApp's character limit.
         Falls back to truncated format, then minimal confirmation if needed.
+        Pass the output of format() as `formatted` if it has already been built.
         """
         # Try full format first
-        full_message = f"{prefix}{self.format()}{suffix}"
+        if formatted is None:
+            formatted = self.format()
+        full_message = f"{prefix}{formatted}{suffix}"
 
         len_full = len(full_message)
         if  len_full <= self.WHATSAPP_CHAR_LIMIT:
@@ -167,6 +170,10 @@ class JobsToBeDoneDocumentModel(StructuredDocumentModel):
         description="Specific tasks, next steps, and items to be added to be registered."
     )
 
+    def _format_action_items(self) -> str:
+        """Render action items as a bulleted list"""
+        return "\n".join(["• " + item for item in self.action_items])
+
     def format(self) -> str:
         formatted_text = f"""*Summary:*
 {self.summary}
@@ -178,7 +185,7 @@ class JobsToBeDoneDocumentModel(StructuredDocumentModel):
 {self.context}
 
 *Action Items:*
-{chr(10).join(f'• {item}' for item in self.action_items)}
+{self._format_action_items()}
 """
         return formatted_text
 
@@ -188,7 +195,7 @@ class JobsToBeDoneDocumentModel(StructuredDocumentModel):
 {self.summary}
 
 *Action Items:*
-{chr(10).join(f'• {item}' for item in self.action_items)}
+{self._format_action_items()}
 
 ---
 Rest of job information truncated.
@@ -16,6 +16,20 @@ class TwilioWhatsAppClient:
         self.from_number = settings.twilio_whatsapp_number
         self.base_url = f"https://api.twilio.com/2010-04-01/Accounts/{self.account_sid}"
         self.auth = (self.account_sid, self.auth_token)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all requests, so connections to Twilio are kept alive between calls."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(auth=self.auth)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def download_media(self, media_url: str) -> bytes:
         """
@@ -27,10 +41,9 @@ class TwilioWhatsAppClient:
         Returns:
             bytes: Media file content
         """
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(media_url, auth=self.auth)
-            response.raise_for_status()
-            return response.content
+        response = await self.client.get(media_url, follow_redirects=True)
+        response.raise_for_status()
+        return response.content
 
     async def send_message(self, recipient_phone: str, body: str) -> dict:
         """
@@ -55,10 +68,9 @@ class TwilioWhatsAppClient:
         }
 
         logger.info(f"Sending POST to url {url} with payload {payload}")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=payload, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(url, data=payload)
+        response.raise_for_status()
+        return response.json()
         
     async def send_templated_message(
         self,
@@ -91,7 +103,6 @@ class TwilioWhatsAppClient:
             payload["ContentVariables"] = json.dumps(content_variables)
 
         logger.info(f"Sending POST to url {url} with templated payload {payload}")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=payload, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(url, data=payload)
+        response.raise_for_status()
+        return response.json()
@@ -3,15 +3,27 @@
 import os
 import json
 import pytest
-from urllib.parse import urlencode
+from urllib.parse import parse_qsl, urlencode
 from unittest.mock import AsyncMock
 from twilio.request_validator import RequestValidator
 
 # The handler function to be tested
+from webhook_handler import handler
 from webhook_handler.handler import lambda_handler
 from ai_voice_shared import TwilioWebhookPayload
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Drop clients cached by earlier tests so each test's patches take effect."""
+    factories = (handler._get_sqs_client, handler._get_customer_lookup_client, handler._get_signature_hmac)
+    for factory in factories:
+        factory.cache_clear()
+    yield
+    for factory in factories:
+        factory.cache_clear()
+
+
 @pytest.fixture
 def twilio_auth_token() -> str:
     """A fake Twilio auth token."""
@@ -24,6 +36,14 @@ def validator(twilio_auth_token: str) -> RequestValidator:
     return RequestValidator(twilio_auth_token)
 
 
+def test_compute_signature_matches_twilio_validator(validator, twilio_auth_token):
+    """Test the inline signature matches Twilio's, including names that prefix each other."""
+    url = "https://test-api-gw.amazonaws.com/prod/webhook"
+    params = {"A": "zoo", "AB": "c", "Body": "", "From": "whatsapp:+1234567890"}
+
+    assert handler._compute_signature(twilio_auth_token, url, params) == validator.compute_signature(url, params)
+
+
 @pytest.fixture
 def base_event_params() -> dict:
     """Base parameters for a valid Twilio request."""
@@ -85,11 +105,38 @@ def test_handler_successful_processing(mocker, api_gateway_event, twilio_auth_to
 
     # Verify SQS was called correctly
     mock_sqs_client.send_message.assert_called_once()
-    sent_message_body = json.loads(mock_sqs_client.send_message.call_args.kwargs["MessageBody"])
-    
-    # The body sent to SQS is a JSON dump of the Pydantic model
-    validated_payload = TwilioWebhookPayload(**base_event_params)
-    assert sent_message_body == json.loads(validated_payload.model_dump_json())
+    send_kwargs = mock_sqs_client.send_message.call_args.kwargs
+
+    # The verified form body is forwarded as received, tagged with its content type
+    assert send_kwargs["MessageBody"] == api_gateway_event["body"]
+    assert send_kwargs["MessageAttributes"]["ContentType"]["StringValue"] == "application/x-www-form-urlencoded"
+    sent_params = dict(parse_qsl(send_kwargs["MessageBody"], keep_blank_values=True))
+    assert TwilioWebhookPayload(**sent_params) == TwilioWebhookPayload(**base_event_params)
+
+
+def test_handler_reuses_clients_across_invocations(mocker, api_gateway_event, twilio_auth_token):
+    """Test that warm invocations reuse the SQS and customer lookup clients."""
+    mocker.patch.dict(os.environ, {
+        "TWILIO_AUTH_TOKEN": twilio_auth_token,
+        "SQS_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/12345/test-queue",
+        "AWS_REGION": "us-east-1",
+    })
+
+    mock_sqs_client = mocker.MagicMock()
+    mock_boto3_client = mocker.patch("webhook_handler.handler.boto3.client", return_value=mock_sqs_client)
+
+    mock_customer_client = mocker.MagicMock()
+    mock_customer_client.fetch_customer_metadata = AsyncMock(return_value=mocker.MagicMock())
+    mock_customer_client_cls = mocker.patch(
+        "webhook_handler.handler.CustomerLookupClient", return_value=mock_customer_client
+    )
+
+    assert lambda_handler(api_gateway_event, None)["statusCode"] == 200
+    assert lambda_handler(api_gateway_event, None)["statusCode"] == 200
+
+    mock_boto3_client.assert_called_once_with("sqs")
+    mock_customer_client_cls.assert_called_once_with()
+    assert mock_sqs_client.send_message.call_count == 2
 
 
 def test_handler_returns_401_for_unauthorized_sender(mocker, api_gateway_event, twilio_auth_token, base_event_params):
@@ -8,13 +8,14 @@ is genuine, then forwards the event to an AWS SQS queue for processing.
 import os
 import json
 import boto3
+import base64
+import hashlib
+import hmac
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any
-from urllib.parse import parse_qs
-
-# Twilio's request validator
-from twilio.request_validator import RequestValidator
+from urllib.parse import parse_qsl
 
 # Customer lookup service and models from shared library
 from ai_voice_shared import CustomerLookupClient, TwilioWebhookPayload
@@ -22,11 +23,63 @@ from ai_voice_shared import CustomerLookupClient, TwilioWebhookPayload
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Content type of the SQS message body: the verified webhook body, forwarded as received
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+# Clients are created on first use and reused across warm invocations, so only
+# the signature check and the request itself run per webhook
+@lru_cache(maxsize=1)
+def _get_sqs_client():
+    return boto3.client("sqs")
+
+
+@lru_cache(maxsize=1)
+def _get_customer_lookup_client() -> CustomerLookupClient:
+    return CustomerLookupClient()
+
+
+@lru_cache(maxsize=1)
+def _get_signature_hmac(twilio_auth_token: str) -> hmac.HMAC:
+    # Keyed by token, so a rotated TWILIO_AUTH_TOKEN gets a new key; callers copy it
+    return hmac.new(twilio_auth_token.encode("utf-8"), digestmod=hashlib.sha1)
+
+
+def _compute_signature(twilio_auth_token: str, url: str, params: Dict[str, str]) -> str:
+    """
+    Compute Twilio's X-Twilio-Signature for a form-encoded request.
+
+    Twilio signs the request URL followed by each POST parameter name and value,
+    sorted by name, with HMAC-SHA1 keyed by the auth token.
+    """
+    mac = _get_signature_hmac(twilio_auth_token).copy()
+    mac.update(url.encode("utf-8"))
+    for name, value in sorted(params.items()):
+        mac.update((name + value).encode("utf-8"))
+    return base64.b64encode(mac.digest()).decode("ascii")
+
+
+# Event loop reused across warm invocations. The cached customer lookup client
+# keeps its HTTP connection pool bound to the loop it was first used on, so
+# asyncio.run (a new loop per call) would break it.
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the module-level event loop, creating it on first use."""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Handle webhook event notifications from Twilio.
     """
-    logger.info(f"Triggering handler with event: {event}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Triggering handler with event: %s", json.dumps(event))
     # Get configuration from environment
     twilio_auth_token = os.environ.get("TWILIO_AUTH_TOKEN")
     sqs_queue_url = os.environ.get("SQS_QUEUE_URL")
@@ -34,30 +87,26 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if not twilio_auth_token:
         err_msg = "TWILIO_AUTH_TOKEN not configured"
         status_code = 500
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     if not sqs_queue_url:
         err_msg = "SQS_QUEUE_URL not configured"
         status_code = 500
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
-    # Initialize SQS client
-    sqs = boto3.client("sqs")
+    sqs = _get_sqs_client()
 
-    # Initialize customer lookup service for phone number authorization
+    # Customer lookup service for phone number authorization
     try:
-        customer_lookup_client = CustomerLookupClient()
+        customer_lookup_client = _get_customer_lookup_client()
     except Exception as e:
         err_msg = f"Failed to initialize customer lookup service: {str(e)}"
         status_code = 500
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
-    # Initialize the validator with your Auth Token
-    validator = RequestValidator(twilio_auth_token)
-
     # Get the signature from headers (case-insensitive)
     headers = event.get("headers", {})
     signature = headers.get("X-Twilio-Signature") or headers.get("x-twilio-signature")
@@ -65,7 +114,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if not signature:
         err_msg = "Missing X-Twilio-Signature header"
         status_code = 401
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     # Construct the full URL that Twilio requested
@@ -97,49 +146,57 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if not raw_body:
         err_msg = "Missing request body"
         status_code = 400
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     # Decode base64 encoded body if necessary (HTTP API v2 may encode the body)
     if event.get("isBase64Encoded", False):
-        import base64
         raw_body = base64.b64decode(raw_body).decode("utf-8")
 
-    # The validator needs the POST parameters as a dictionary
+    # The signature is computed over the POST parameters as a dictionary
     # IMPORTANT: keep_blank_values=True is required to preserve empty parameters like Body=
     # Twilio includes empty parameters in signature calculation
-    post_params = {k: v[0] for k, v in parse_qs(raw_body, keep_blank_values=True).items()}
+    # Twilio never repeats a parameter, so the pairs map straight onto a dict
+    post_params = dict(parse_qsl(raw_body, keep_blank_values=True))
 
     # Debug logging for signature validation
-    logger.info(f"Validating signature for URL: {request_url}")
-    logger.info(f"POST parameters: {post_params}")
-    logger.info(f"Signature: {signature}")
+    logger.info("Validating signature for URL: %s", request_url)
+    logger.info("POST parameters: %s", post_params)
+    logger.info("Signature: %s", signature)
 
     # Check phone number authorization using customer lookup API
     from_number = post_params.get("From", "")
     if not from_number:
         err_msg = "Missing 'From' field in request"
         status_code = 400
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     try:
         # Attempt to fetch customer metadata (this validates authorization)
-        customer_metadata = asyncio.run(customer_lookup_client.fetch_customer_metadata(from_number))
-        logger.info(f"Phone number {from_number} authorized for customer: {customer_metadata.customer_id}, company: {customer_metadata.company_name}")
+        customer_metadata = _get_event_loop().run_until_complete(
+            customer_lookup_client.fetch_customer_metadata(from_number)
+        )
+        logger.info(
+            "Phone number %s authorized for customer: %s, company: %s",
+            from_number,
+            customer_metadata.customer_id,
+            customer_metadata.company_name,
+        )
     except Exception as e:
         # If lookup fails (404, validation error, etc.), phone number is not authorized
         err_msg = f"Phone number not authorized: {from_number}"
         status_code = 401
-        logger.error(f"{err_msg} - Lookup failed with: {str(e)}")
+        logger.error("%s - Lookup failed with: %s", err_msg, e)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
 
     # Validate the request
-    if not validator.validate(request_url, post_params, signature):
+    expected_signature = _compute_signature(twilio_auth_token, request_url, post_params)
+    if not hmac.compare_digest(expected_signature.encode("ascii"), signature.encode("utf-8")):
         err_msg = "Invalid Twilio signature"
         status_code = 403
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     # At this point, the request is verified.
@@ -149,30 +206,34 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     # Validate the payload structure using the shared TwilioWebhookPayload model
     try:
         validated_payload = TwilioWebhookPayload(**post_params)
-        logger.info(f"Validated webhook payload for message {validated_payload.MessageSid}")
+        logger.info("Validated webhook payload for message %s", validated_payload.MessageSid)
     except Exception as e:
         err_msg = f"Invalid webhook payload structure: {str(e)}"
         status_code = 400
-        logger.error(f"{err_msg}, returning {status_code}")
+        logger.error("%s, returning %s", err_msg, status_code)
         return {"statusCode": status_code, "body": json.dumps({"error": err_msg})}
 
     try:
         # Send the validated Twilio payload to SQS for processing
-        message_body = validated_payload.model_dump_json()
-        logger.info(f"Sending message {message_body} to SQS")
+        logger.info("Sending message %s to SQS", raw_body)
         sqs.send_message(
             QueueUrl=sqs_queue_url,
-            # We send the dictionary as a JSON string for easy processing later
-            MessageBody=message_body,
+            # The raw form body is forwarded instead of re-serializing the payload;
+            # the ContentType attribute tells the voice parser how to parse it
+            MessageBody=raw_body,
             MessageAttributes={
                 "Source": {
                     "StringValue": "TwilioWhatsAppWebhook",
                     "DataType": "String"
-                }
+                },
+                "ContentType": {
+                    "StringValue": FORM_CONTENT_TYPE,
+                    "DataType": "String"
+                },
             }
         )
     except Exception as e:
-        logger.error(f"Error sending message to SQS: {str(e)}")
+        logger.error("Error sending message to SQS: %s", e)
         return {"statusCode": 500, "body": json.dumps({"error": "Failed to process webhook"})}
 
     # Return 200 OK to Twilio with empty body